@@ -2,17 +2,13 @@
 Configuration for Web Search Pro
 Supports YAML configuration file with fallback to defaults.
 """
+import functools
 import os
+import pickle
+import threading
 from pathlib import Path
 from typing import Any, Dict, Optional
 
-# Try to import YAML support
-try:
-    import yaml
-    YAML_AVAILABLE = True
-except ImportError:
-    YAML_AVAILABLE = False
-
 # Base directories
 BASE_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
 CONFIG_DIR = BASE_DIR / "config"
@@ -21,63 +17,131 @@ RESULTS_DIR = BASE_DIR / "results"
 JOURNAL_DIR = BASE_DIR / "journal"
 SESSIONS_DIR = BASE_DIR / "sessions"
 
-# Ensure directories exist
-for d in [CONFIG_DIR, LOGS_DIR, RESULTS_DIR, JOURNAL_DIR, SESSIONS_DIR]:
-    d.mkdir(exist_ok=True)
+# Ensure directories exist (one scandir instead of a stat per directory)
+_existing_dirs = {e.name for e in os.scandir(BASE_DIR) if e.is_dir()}
+for d in (CONFIG_DIR, LOGS_DIR, RESULTS_DIR, JOURNAL_DIR, SESSIONS_DIR):
+    if d.name not in _existing_dirs:
+        d.mkdir(exist_ok=True)
+del _existing_dirs
 
 
 class ConfigLoader:
     """Loads and manages configuration from YAML file with defaults."""
     
     _instance: Optional['ConfigLoader'] = None
-    _config: Dict[str, Any] = {}
+    _lock = threading.Lock()
     
     def __new__(cls):
+        # Double-checked locking: only the first construction pays for the lock
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._load_config()
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._config: Dict[str, Any] = {}
+                    instance._flat: Dict[str, Any] = {}
+                    instance._load_config()
+                    cls._instance = instance
         return cls._instance
     
     def _load_config(self):
-        """Load configuration from YAML file."""
+        """Load configuration and rebuild the flattened key index."""
+        self._read_config()
+        self._flat = {}
+        self._flatten('', self._config)
+    
+    def _flatten(self, prefix: str, node: Dict[str, Any]):
+        """Index every non-None node of the config tree by its dotted path."""
+        for k, v in node.items():
+            if v is None:
+                continue
+            path = f"{prefix}{k}"
+            self._flat[path] = v
+            if isinstance(v, dict):
+                self._flatten(f"{path}.", v)
+    
+    def _read_config(self):
+        """Read configuration from YAML file (via the parsed-config cache)."""
         config_file = CONFIG_DIR / "websearchpro.yaml"
         
-        if YAML_AVAILABLE and config_file.exists():
-            with open(config_file, 'r', encoding='utf-8') as f:
-                self._config = yaml.safe_load(f) or {}
-        else:
+        if not config_file.exists():
+            self._config = {}
+            return
+        
+        # Reuse the pickled parse if the YAML file is unchanged
+        stat = config_file.stat()
+        cache_file = config_file.with_suffix(".yaml.cache")
+        try:
+            with open(cache_file, 'rb') as f:
+                mtime_ns, size, data = pickle.load(f)
+            if (mtime_ns, size) == (stat.st_mtime_ns, stat.st_size):
+                self._config = data
+                return
+        except (OSError, pickle.PickleError, EOFError, ValueError, TypeError):
+            pass
+        
+        # YAML support is imported only when there is something to parse
+        try:
+            import yaml
+        except ImportError:
             self._config = {}
+            return
+        
+        # Prefer libyaml's C loader when PyYAML was built with it
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with open(config_file, 'r', encoding='utf-8') as f:
+            self._config = yaml.load(f, Loader=loader) or {}
+        
+        # Write the cache atomically so concurrent starts never see a torn file
+        tmp_file = cache_file.with_suffix(f".cache.{os.getpid()}.tmp")
+        try:
+            with open(tmp_file, 'wb') as f:
+                pickle.dump((stat.st_mtime_ns, stat.st_size, self._config), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value using dot notation (e.g., 'search.timeout')."""
-        keys = key.split('.')
-        value = self._config
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k)
-            else:
-                return default
-            if value is None:
-                return default
-        return value
+        if not self._flat:
+            return default
+        return self._flat.get(key, default)
     
     def reload(self):
-        """Reload configuration from file."""
+        """Reload configuration from file, discarding the parsed-config cache."""
+        try:
+            (CONFIG_DIR / "websearchpro.yaml.cache").unlink()
+        except OSError:
+            pass
         self._load_config()
 
 
 # Global config loader instance
 _config = ConfigLoader()
 
+# Sentinel for "key not configured" so defaults never enter the memo
+_MISSING = object()
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_get(key: str) -> Any:
+    """Memoized raw lookup; returns _MISSING for unset keys."""
+    return _config.get(key, _MISSING)
+
 
 def get_config(key: str, default: Any = None) -> Any:
     """Get configuration value."""
-    return _config.get(key, default)
+    value = _cached_get(key)
+    return default if value is _MISSING else value
 
 
 def reload_config():
     """Reload configuration from file."""
     _config.reload()
+    _cached_get.cache_clear()
 
 
 # Tor Configuration (with YAML fallback)
@@ -89,6 +153,8 @@ TOR_CONTROL_PORT = get_config('sources.darknet.tor.control_port', 9051)
 DEFAULT_TIMEOUT = get_config('search.default_timeout', 600)
 MAX_RESULTS_PER_ENGINE = get_config('search.max_results_per_engine', 50)
 REQUEST_DELAY = get_config('search.request_delay', 2)
+SEARCH_CACHE_TTL = get_config('search.cache_ttl', 300)
+MAX_REQUESTS_PER_HOST = get_config('search.max_requests_per_host', 2)
 
 # User Agent rotation
 USER_AGENTS = get_config('user_agents', [
@@ -148,6 +214,10 @@ CHECKPOINT_DIR = SESSIONS_DIR
 AUTO_CHECKPOINT = get_config('state.auto_checkpoint', True)
 CHECKPOINT_INTERVAL = get_config('state.checkpoint_interval', 60)
 
+# Journal write batching
+JOURNAL_FLUSH_ENTRIES = get_config('logging.journal_flush_entries', 64)
+JOURNAL_FLUSH_INTERVAL = get_config('logging.journal_flush_interval', 1.0)
+
 # Ranking configuration
 RANKING_ENABLED = get_config('results.ranking.enabled', True)
 RANKING_WEIGHTS = get_config('results.ranking.weights', {
@@ -2,14 +2,45 @@
 Journaling and Logging System for Web Search Pro
 Tracks all search activities, results, and provides audit trail.
 """
+import atexit
 import json
 import os
+import re
+import secrets
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, Any, List
-import hashlib
 
-from config import JOURNAL_DIR, LOGS_DIR, RESULTS_DIR
+from config import (
+    JOURNAL_DIR, LOGS_DIR, RESULTS_DIR,
+    JOURNAL_FLUSH_ENTRIES, JOURNAL_FLUSH_INTERVAL
+)
+
+# Faster JSON encoding when orjson is installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Anything other than word characters, space and hyphen becomes "_" in filenames
+# (\w matches str.isalnum() characters plus the underscore)
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w \-]')
+
+
+def _dumps_pretty(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _dumps_line(obj: Any) -> str:
+    """Serialize to a single-line JSON string."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False)
 
 
 class SearchJournal:
@@ -21,45 +52,69 @@ class SearchJournal:
     def __init__(self, session_id: Optional[str] = None):
         self.session_id = session_id or self._generate_session_id()
         self.session_start = datetime.now()
-        self.journal_file = JOURNAL_DIR / f"journal_{self.session_id}.json"
+        self.journal_file = JOURNAL_DIR / f"journal_{self.session_id}.jsonl"
+        self.meta_file = JOURNAL_DIR / f"journal_meta_{self.session_id}.json"
         self.log_file = LOGS_DIR / f"search_{self.session_id}.log"
         self.entries: List[Dict[str, Any]] = []
+        self._entry_counter = 0
+        # Journal lines are buffered and written in batches (see flush())
+        self._pending: List[str] = []
+        self._last_flush = time.monotonic()
+        # Set by close_session(); later writes are dropped
+        self._closed = False
+        # Line-buffered so each log line reaches disk without an open() per call
+        self._log_fh = open(self.log_file, 'a', encoding='utf-8', buffering=1)
         self._init_journal()
+        # Buffered entries must not be lost when the program exits without
+        # close_session() (Ctrl-C, an uncaught exception, sys.exit)
+        atexit.register(self.close_session)
 
     def _generate_session_id(self) -> str:
         """Generate unique session ID based on timestamp."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        hash_suffix = hashlib.md5(str(datetime.now().timestamp()).encode()).hexdigest()[:6]
+        hash_suffix = secrets.token_hex(3)
         return f"{timestamp}_{hash_suffix}"
 
     def _init_journal(self):
-        """Initialize journal file with session metadata."""
+        """
+        Initialize the journal: session metadata goes to a small sidecar,
+        entries are appended to a JSON Lines file one object per line.
+        """
         metadata = {
             "session_id": self.session_id,
             "started_at": self.session_start.isoformat(),
-            "entries": []
+            "journal_file": str(self.journal_file),
         }
-        self._save_journal(metadata)
+        with open(self.meta_file, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        self._journal_fh = open(self.journal_file, 'a', encoding='utf-8')
         self.log("INFO", f"Session started: {self.session_id}")
 
-    def _save_journal(self, data: Dict[str, Any]):
-        """Save journal data to file."""
-        with open(self.journal_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-
-    def _load_journal(self) -> Dict[str, Any]:
-        """Load journal data from file."""
-        if self.journal_file.exists():
-            with open(self.journal_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {"session_id": self.session_id, "entries": []}
-
-    def log(self, level: str, message: str):
-        """Write log entry to log file."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    def flush(self):
+        """Write buffered journal entries to disk."""
+        if self._closed:
+            return
+        if self._pending:
+            self._journal_fh.write("".join(self._pending))
+            self._pending.clear()
+        self._journal_fh.flush()
+        self._last_flush = time.monotonic()
+
+    def _iter_entries(self):
+        """Stream journal entries from disk without loading the whole file."""
+        self.flush()
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def log(self, level: str, message: str, now: Optional[datetime] = None):
+        """Write log entry to log file (now: reuse a timestamp the caller already has)."""
+        if self._closed:
+            return
+        timestamp = (now or datetime.now()).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
         log_entry = f"[{timestamp}] [{level}] {message}\n"
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(log_entry)
+        self._log_fh.write(log_entry)
 
     def add_entry(self, entry_type: str, data: Dict[str, Any]) -> str:
         """
@@ -70,24 +125,29 @@ class SearchJournal:
             data: Entry data
 
         Returns:
-            Entry ID
+            Entry ID ("" once the session is closed)
         """
-        entry_id = hashlib.md5(
-            f"{datetime.now().timestamp()}{entry_type}".encode()
-        ).hexdigest()[:12]
+        if self._closed:
+            return ""
+        now = datetime.now()
+
+        # Entry IDs only need to be unique within the session
+        self._entry_counter += 1
+        entry_id = f"{self._entry_counter:012x}"
 
         entry = {
             "id": entry_id,
             "type": entry_type,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "data": data
         }
 
-        journal = self._load_journal()
-        journal["entries"].append(entry)
-        self._save_journal(journal)
+        self._pending.append(_dumps_line(entry) + "\n")
+        if (len(self._pending) >= JOURNAL_FLUSH_ENTRIES or
+                time.monotonic() - self._last_flush > JOURNAL_FLUSH_INTERVAL):
+            self.flush()
 
-        self.log("INFO", f"Journal entry added: {entry_type} - {entry_id}")
+        self.log("INFO", f"Journal entry added: {entry_type} - {entry_id}", now)
         return entry_id
 
     def record_search_start(self, query: str, engines: List[str], search_type: str) -> str:
@@ -141,75 +201,100 @@ class SearchJournal:
         Returns:
             Path to saved file
         """
-        safe_query = "".join(c if c.isalnum() or c in " -_" else "_" for c in query)[:50]
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        safe_query = _UNSAFE_FILENAME_RE.sub('_', query[:50])
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         filename = f"results_{safe_query}_{timestamp}.{format}"
         filepath = RESULTS_DIR / filename
 
         if format == "json":
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump({
+            with open(filepath, 'wb') as f:
+                f.write(_dumps_pretty({
                     "query": query,
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now.isoformat(),
                     "results_count": len(results),
                     "results": results
-                }, f, indent=2, ensure_ascii=False)
+                }))
 
         elif format == "txt":
+            parts = [
+                f"Search Results for: {query}\n"
+                f"Timestamp: {now.isoformat()}\n"
+                f"Total Results: {len(results)}\n"
+                + "=" * 60 + "\n\n"
+            ]
+            for i, result in enumerate(results, 1):
+                snippet = result.get('snippet')
+                parts.append(
+                    f"[{i}] {result.get('title', 'No Title')}\n"
+                    f"    URL: {result.get('url', 'N/A')}\n"
+                    f"    Source: {result.get('engine', 'Unknown')}\n"
+                    + (f"    Snippet: {snippet[:200]}...\n" if snippet else "")
+                    + "\n"
+                )
             with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"Search Results for: {query}\n")
-                f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-                f.write(f"Total Results: {len(results)}\n")
-                f.write("=" * 60 + "\n\n")
-                for i, result in enumerate(results, 1):
-                    f.write(f"[{i}] {result.get('title', 'No Title')}\n")
-                    f.write(f"    URL: {result.get('url', 'N/A')}\n")
-                    f.write(f"    Source: {result.get('engine', 'Unknown')}\n")
-                    if result.get('snippet'):
-                        f.write(f"    Snippet: {result.get('snippet')[:200]}...\n")
-                    f.write("\n")
+                f.write("".join(parts))
 
         elif format == "md":
+            parts = [
+                f"# Search Results: {query}\n\n"
+                f"**Timestamp:** {now.isoformat()}\n"
+                f"**Total Results:** {len(results)}\n\n"
+                "---\n\n"
+            ]
+            for i, result in enumerate(results, 1):
+                snippet = result.get('snippet')
+                parts.append(
+                    f"## {i}. {result.get('title', 'No Title')}\n\n"
+                    f"- **URL:** [{result.get('url', 'N/A')}]({result.get('url', '')})\n"
+                    f"- **Source:** {result.get('engine', 'Unknown')}\n"
+                    + (f"- **Snippet:** {snippet}\n" if snippet else "")
+                    + "\n"
+                )
             with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"# Search Results: {query}\n\n")
-                f.write(f"**Timestamp:** {datetime.now().isoformat()}\n")
-                f.write(f"**Total Results:** {len(results)}\n\n")
-                f.write("---\n\n")
-                for i, result in enumerate(results, 1):
-                    f.write(f"## {i}. {result.get('title', 'No Title')}\n\n")
-                    f.write(f"- **URL:** [{result.get('url', 'N/A')}]({result.get('url', '')})\n")
-                    f.write(f"- **Source:** {result.get('engine', 'Unknown')}\n")
-                    if result.get('snippet'):
-                        f.write(f"- **Snippet:** {result.get('snippet')}\n")
-                    f.write("\n")
+                f.write("".join(parts))
 
         self.log("INFO", f"Results saved to: {filepath}")
         return filepath
 
     def get_session_summary(self) -> Dict[str, Any]:
         """Get summary of current session."""
-        journal = self._load_journal()
-        entries = journal.get("entries", [])
-
-        searches = [e for e in entries if e["type"] == "search_start"]
-        results = [e for e in entries if e["type"] == "search_result"]
-        errors = [e for e in entries if e["type"] == "error"]
+        total_searches = 0
+        total_results = 0
+        total_errors = 0
 
-        total_results = sum(e["data"].get("results_count", 0) for e in results)
+        for entry in self._iter_entries():
+            entry_type = entry["type"]
+            if entry_type == "search_start":
+                total_searches += 1
+            elif entry_type == "search_result":
+                total_results += entry["data"].get("results_count", 0)
+            elif entry_type == "error":
+                total_errors += 1
 
         return {
             "session_id": self.session_id,
             "duration": str(datetime.now() - self.session_start),
-            "total_searches": len(searches),
+            "total_searches": total_searches,
             "total_results": total_results,
-            "total_errors": len(errors),
+            "total_errors": total_errors,
             "journal_file": str(self.journal_file),
             "log_file": str(self.log_file)
         }
 
     def close_session(self):
-        """Close the session and finalize journal."""
+        """
+        Close the session and finalize journal. Safe to call more than once
+        (e.g. from both the SIGINT handler and the end of run()).
+        """
+        if self._closed:
+            return self.get_session_summary()
+        atexit.unregister(self.close_session)
         summary = self.get_session_summary()
         self.add_entry("session_end", summary)
         self.log("INFO", f"Session ended: {self.session_id}")
+        self.flush()
+        self._closed = True
+        self._journal_fh.close()
+        self._log_fh.close()
         return summary
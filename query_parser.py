@@ -11,11 +11,54 @@ Handles advanced search syntax like:
 - Boost operator: term^N
 - Query expansion (synonyms, related terms)
 """
+import fnmatch
+import itertools
 import re
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Tuple
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Callable, Iterator, List, NamedTuple, Optional, Dict, Any, Tuple
 from enum import Enum
 
+# Linear-time matching for the parse() patterns when google-re2 is installed
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+
+# Token codes used by QueryParser._process_terms
+_TERM, _AND, _OR, _NOT = range(4)
+_OP_CODES = {
+    'AND': _AND, '&': _AND, '+': _AND,
+    'OR': _OR, '|': _OR,
+    'NOT': _NOT,
+}
+# Every upper/lower-case spelling of each keyword (and, And, aNd, ...), so
+# tokens are classified without upper-casing each one
+_OP_CODES_CI = {
+    ''.join(chars): code
+    for op, code in _OP_CODES.items()
+    for chars in itertools.product(*({c.lower(), c.upper()} for c in op))
+}
+
+# Placeholders accepted by QueryParser.compile_template: (operator prefix, value regex)
+_TEMPLATE_FIELDS = {
+    'terms': ('', r'\S+(?:\s+\S+)*?'),
+    'site': ('site:', r'\S+'),
+    'filetype': ('filetype:', r'\S+'),
+    'after': ('after:', r'\d{4}-\d{2}-\d{2}'),
+    'before': ('before:', r'\d{4}-\d{2}-\d{2}'),
+}
+_TEMPLATE_FIELD_RE = re.compile(r'\{(\w+)\}')
+# Terms a template parser may take as-is; anything fancier goes through parse()
+_PLAIN_TERM_RE = re.compile(r'\w+(?:[.\-]\w+)*')
+
+# Grep-style operators rewritten to keywords before tokenizing
+_OP_NORM = {'&&': ' AND ', '||': ' OR ', '!': ' NOT '}
+_OP_NORM_RE = re.compile(r'&&|\|\||!')
+
 
 class TokenType(Enum):
     TERM = "term"
@@ -36,8 +79,7 @@ class TokenType(Enum):
     BOOST = "boost"
 
 
-@dataclass
-class QueryToken:
+class QueryToken(NamedTuple):
     """Represents a parsed query token."""
     type: TokenType
     value: str
@@ -46,50 +88,86 @@ class QueryToken:
     proximity: int = 0
 
 
+def _copy_optional(items: Optional[list], copy_item: Optional[Callable] = None) -> Optional[list]:
+    """Copy an optional list field (and optionally each item); None stays None."""
+    if items is None:
+        return None
+    if copy_item is None:
+        return list(items)
+    return [copy_item(item) for item in items]
+
+
 @dataclass
 class ParsedQuery:
     """Represents a fully parsed search query."""
     original: str
-    tokens: List[QueryToken] = field(default_factory=list)
     required_terms: List[str] = field(default_factory=list)
     optional_terms: List[str] = field(default_factory=list)  # OR terms
     excluded_terms: List[str] = field(default_factory=list)
     phrases: List[str] = field(default_factory=list)
-    or_groups: List[List[str]] = field(default_factory=list)  # Groups of OR terms
-    proximity_searches: List[Tuple[str, int]] = field(default_factory=list)  # (phrase, distance)
-    boosted_terms: List[Tuple[str, float]] = field(default_factory=list)  # (term, boost)
-    wildcard_terms: List[str] = field(default_factory=list)
+    # The less common features default to None rather than an empty list,
+    # so a typical parse does not allocate a list per unused field
+    or_groups: Optional[List[List[str]]] = None  # Groups of OR terms
+    proximity_searches: Optional[List[Tuple[str, int]]] = None  # (phrase, distance)
+    boosted_terms: Optional[List[Tuple[str, float]]] = None  # (term, boost)
+    wildcard_terms: Optional[List[str]] = None
     site_filter: Optional[str] = None
     filetype_filter: Optional[str] = None
     date_after: Optional[str] = None
     date_before: Optional[str] = None
-    expanded_terms: List[str] = field(default_factory=list)  # Synonyms/related terms
+    expanded_terms: Optional[List[str]] = None  # Synonyms/related terms
+
+    # Per-engine memo of to_search_string() and its engine-independent middle
+    _search_strings: Dict[str, str] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _static_parts: Optional[List[str]] = field(default=None, init=False, repr=False, compare=False)
+    # (start, end) offsets of the site:/filetype: operators in original
+    _filter_spans: Optional[Dict[str, Tuple[Tuple[int, int], ...]]] = field(
+        default=None, repr=False, compare=False)
 
     def to_search_string(self, engine: str = "default") -> str:
         """
         Convert parsed query to search string for specific engine.
 
+        The result is memoized per engine; the query is treated as
+        immutable once it has been rendered.
+
         Args:
             engine: Target search engine (duckduckgo, bing, google, etc.)
 
         Returns:
             Formatted search string
         """
-        parts = []
+        cached = self._search_strings.get(engine)
+        if cached is None:
+            cached = self._search_strings[engine] = _engine_builder(engine)(self)
+        return cached
 
-        # Add required terms
+    def _iter_parts(self, req_fmt: Callable[[str], str], date_ok: bool) -> Iterator[str]:
+        """Yield the pieces of the search string in output order."""
         for term in self.required_terms:
-            if engine == "duckduckgo":
-                parts.append(f"+{term}")
-            else:
-                parts.append(term)
+            yield req_fmt(term)
+        # Phrases, OR groups, exclusions and site/filetype filters do not
+        # depend on the engine
+        yield from self._get_static_parts()
+        if date_ok:
+            if self.date_after:
+                yield f"after:{self.date_after}"
+            if self.date_before:
+                yield f"before:{self.date_before}"
+
+    def _get_static_parts(self) -> List[str]:
+        """Build (once) the engine-independent part of the search string."""
+        if self._static_parts is not None:
+            return self._static_parts
+
+        parts = []
 
         # Add phrases
         for phrase in self.phrases:
             parts.append(f'"{phrase}"')
 
         # Add OR groups (term1 OR term2 OR term3)
-        for or_group in self.or_groups:
+        for or_group in self.or_groups or ():
             if len(or_group) > 1:
                 or_part = " OR ".join(or_group)
                 parts.append(f"({or_part})")
@@ -115,28 +193,36 @@ class ParsedQuery:
         if self.filetype_filter:
             parts.append(f"filetype:{self.filetype_filter}")
 
-        if self.date_after:
-            if engine in ["google", "duckduckgo"]:
-                parts.append(f"after:{self.date_after}")
-
-        if self.date_before:
-            if engine in ["google", "duckduckgo"]:
-                parts.append(f"before:{self.date_before}")
-
-        return " ".join(parts)
+        self._static_parts = parts
+        return parts
+
+    def _copy(self) -> 'ParsedQuery':
+        """Copy with fresh lists, so the copy can be mutated independently."""
+        return replace(
+            self,
+            required_terms=list(self.required_terms),
+            optional_terms=list(self.optional_terms),
+            excluded_terms=list(self.excluded_terms),
+            phrases=list(self.phrases),
+            or_groups=_copy_optional(self.or_groups, list),
+            proximity_searches=_copy_optional(self.proximity_searches),
+            boosted_terms=_copy_optional(self.boosted_terms),
+            wildcard_terms=_copy_optional(self.wildcard_terms),
+            expanded_terms=_copy_optional(self.expanded_terms),
+        )
 
     def get_display_info(self) -> Dict[str, Any]:
         """Get query information for display."""
         return {
             "original": self.original,
             "terms": self.required_terms,
-            "or_groups": self.or_groups,
+            "or_groups": self.or_groups or [],
             "excluded": self.excluded_terms,
             "phrases": self.phrases,
-            "proximity": self.proximity_searches,
-            "boosted": self.boosted_terms,
-            "wildcards": self.wildcard_terms,
-            "expanded": self.expanded_terms,
+            "proximity": self.proximity_searches or [],
+            "boosted": self.boosted_terms or [],
+            "wildcards": self.wildcard_terms or [],
+            "expanded": self.expanded_terms or [],
             "filters": {
                 "site": self.site_filter,
                 "filetype": self.filetype_filter,
@@ -146,6 +232,28 @@ class ParsedQuery:
         }
 
 
+# Per-engine search-string builders, created on first use by _engine_builder()
+_ENGINE_BUILDERS: Dict[str, Callable[[ParsedQuery], str]] = {}
+_DATE_FILTER_ENGINES = frozenset(('google', 'duckduckgo'))
+
+
+def _engine_builder(engine: str) -> Callable[[ParsedQuery], str]:
+    """Return the to_search_string() builder specialized for one engine."""
+    builder = _ENGINE_BUILDERS.get(engine)
+    if builder is not None:
+        return builder
+
+    # DuckDuckGo wants required terms marked with +
+    req_fmt = "+{}".format if engine == "duckduckgo" else str
+    date_ok = engine in _DATE_FILTER_ENGINES
+
+    def builder(query: ParsedQuery) -> str:
+        return " ".join(query._iter_parts(req_fmt, date_ok))
+
+    _ENGINE_BUILDERS[engine] = builder
+    return builder
+
+
 class QueryExpander:
     """
     Expands search queries with synonyms and related terms.
@@ -205,22 +313,74 @@ class QueryExpander:
         'cloud': ['aws', 'azure', 'gcp', 'kubernetes'],
     }
     
+    # Freeze both tables into de-duplicated tuples once, at class creation
+    SYNONYMS = {k: tuple(dict.fromkeys(v)) for k, v in SYNONYMS.items()}
+    RELATED_TERMS = {k: tuple(dict.fromkeys(v)) for k, v in RELATED_TERMS.items()}
+    
+    # Trigram -> dictionary keys containing it; built on the first wildcard lookup
+    _trigram_index: Optional[Dict[str, frozenset]] = None
+    _WILDCARD_SPLIT_RE = re.compile(r'[*?]')
+    
     def __init__(self, enable_synonyms: bool = True, enable_related: bool = False):
         self.enable_synonyms = enable_synonyms
         self.enable_related = enable_related
     
     def expand_term(self, term: str, max_expansions: int = 3) -> List[str]:
-        """Expand a single term with synonyms."""
-        expansions = []
+        """Expand a single term with synonyms (wildcard terms match dictionary keys)."""
         term_lower = term.lower()
+        if '*' in term_lower or '?' in term_lower:
+            return self._expand_wildcard(term_lower, max_expansions)
+        expansions = ()
         
-        if self.enable_synonyms and term_lower in self.SYNONYMS:
-            expansions.extend(self.SYNONYMS[term_lower][:max_expansions])
+        if self.enable_synonyms:
+            expansions = self.SYNONYMS.get(term_lower, ())[:max_expansions]
         
-        if self.enable_related and term_lower in self.RELATED_TERMS:
-            expansions.extend(self.RELATED_TERMS[term_lower][:max_expansions])
+        if self.enable_related:
+            related = self.RELATED_TERMS.get(term_lower, ())[:max_expansions]
+            if related:
+                # Order-preserving dedupe against the synonyms
+                return list(dict.fromkeys(expansions + related))
         
-        return list(set(expansions))
+        return list(expansions)
+    
+    @classmethod
+    def _get_trigram_index(cls) -> Dict[str, frozenset]:
+        """Inverted index from trigram to the SYNONYMS/RELATED_TERMS keys containing it."""
+        if cls._trigram_index is None:
+            index: Dict[str, set] = {}
+            for key in cls.SYNONYMS.keys() | cls.RELATED_TERMS.keys():
+                for i in range(len(key) - 2):
+                    index.setdefault(key[i:i + 3], set()).add(key)
+            cls._trigram_index = {t: frozenset(keys) for t, keys in index.items()}
+        return cls._trigram_index
+    
+    def _match_wildcard(self, pattern: str) -> List[str]:
+        """Dictionary keys matching a lower-cased */? pattern."""
+        index = self._get_trigram_index()
+        candidates = None
+        for literal in self._WILDCARD_SPLIT_RE.split(pattern):
+            for i in range(len(literal) - 2):
+                keys = index.get(literal[i:i + 3], frozenset())
+                candidates = keys if candidates is None else candidates & keys
+                if not candidates:
+                    return []
+        if candidates is None:
+            # Too few literal characters for a trigram: check every key
+            candidates = self.SYNONYMS.keys() | self.RELATED_TERMS.keys()
+        return sorted(k for k in candidates if fnmatch.fnmatchcase(k, pattern))
+    
+    def _expand_wildcard(self, pattern: str, max_expansions: int) -> List[str]:
+        """Expand a wildcard term to the matching dictionary terms and their synonyms."""
+        if not pattern.strip('*?'):
+            # A bare wildcard would match the whole dictionary
+            return []
+        expansions = []
+        for key in self._match_wildcard(pattern):
+            if ((self.enable_synonyms and key in self.SYNONYMS) or
+                    (self.enable_related and key in self.RELATED_TERMS)):
+                expansions.append(key)
+                expansions.extend(self.expand_term(key, max_expansions))
+        return list(dict.fromkeys(expansions))[:max_expansions]
     
     def expand_query(self, terms: List[str], max_total: int = 10) -> List[str]:
         """Expand multiple terms."""
@@ -233,7 +393,33 @@ class QueryExpander:
             if len(all_expansions) >= max_total:
                 break
         
-        return list(set(all_expansions))[:max_total]
+        return list(dict.fromkeys(all_expansions))[:max_total]
+    
+    def expand_terms_batch(self, terms: List[str], max_expansions: int = 3) -> Dict[str, List[str]]:
+        """
+        Expand many terms at once (bulk query rewriting).
+        
+        Each distinct lower-cased term is looked up only once, however often
+        it appears in the batch.
+        
+        Args:
+            terms: Terms to expand
+            max_expansions: Per-table limit, as in expand_term
+        
+        Returns:
+            Mapping of each input term to its expansions
+        """
+        by_lower: Dict[str, List[str]] = {}
+        result: Dict[str, List[str]] = {}
+        for term in terms:
+            if term in result:
+                continue
+            term_lower = term.lower()
+            expansions = by_lower.get(term_lower)
+            if expansions is None:
+                expansions = by_lower[term_lower] = self.expand_term(term_lower, max_expansions)
+            result[term] = list(expansions)
+        return result
 
 
 class QueryParser:
@@ -275,17 +461,29 @@ class QueryParser:
         "optical quality"~5         -> Proximity search
     """
 
-    # Regex patterns
-    PHRASE_PATTERN = r'"([^"]+)"'
-    PHRASE_PROXIMITY_PATTERN = r'"([^"]+)"~(\d+)'
-    SITE_PATTERN = r'site:(\S+)'
-    FILETYPE_PATTERN = r'filetype:(\S+)'
-    INTITLE_PATTERN = r'intitle:(\S+)'
-    INURL_PATTERN = r'inurl:(\S+)'
-    DATE_AFTER_PATTERN = r'after:(\d{4}-\d{2}-\d{2})'
-    DATE_BEFORE_PATTERN = r'before:(\d{4}-\d{2}-\d{2})'
-    BOOST_PATTERN = r'(\w+)\^(\d+(?:\.\d+)?)'
-    WILDCARD_PATTERN = r'(\w+[*?]\w*|\w*[*?]\w+)'
+    # Every extractable operator in one alternation, scanned once per parse.
+    # Proximity is listed before the plain phrase so "a b"~3 wins over "a b".
+    OPERATOR_RE = re.compile(
+        r'(?P<proximity>"(?P<prox_phrase>[^"]+)"~(?P<prox_dist>\d+))'
+        r'|(?P<phrase>"(?P<phrase_text>[^"]+)")'
+        r'|(?P<site>site:(?P<site_value>\S+))'
+        r'|(?P<filetype>filetype:(?P<filetype_value>\S+))'
+        r'|(?P<after>after:(?P<after_value>\d{4}-\d{2}-\d{2}))'
+        r'|(?P<before>before:(?P<before_value>\d{4}-\d{2}-\d{2}))'
+        r'|(?P<intitle>intitle:(?P<intitle_value>\S+))'
+        r'|(?P<inurl>inurl:(?P<inurl_value>\S+))'
+        r'|(?P<boost>(?P<boost_term>\w+)\^(?P<boost_value>\d+(?:\.\d+)?))'
+    )
+    WILDCARD_RE = re.compile(r'(\w+[*?]\w*|\w*[*?]\w+)')
+
+    # RE2 counterparts: no backtracking, so unbalanced quotes and other
+    # adversarial input cannot blow up matching time
+    if RE2_AVAILABLE:
+        OPERATOR_RE2 = re2.compile(OPERATOR_RE.pattern)
+        WILDCARD_RE2 = re2.compile(WILDCARD_RE.pattern)
+
+    # Number of distinct (query, expand) parses kept per parser
+    PARSE_CACHE_SIZE = 1024
 
     def __init__(self, enable_expansion: bool = False):
         self.operators = {
@@ -302,11 +500,15 @@ class QueryParser:
         }
         self.enable_expansion = enable_expansion
         self.expander = QueryExpander() if enable_expansion else None
+        self._parse_cache: 'OrderedDict[Tuple[str, bool], ParsedQuery]' = OrderedDict()
 
     def parse(self, query: str, expand: bool = None) -> ParsedQuery:
         """
         Parse a search query string into structured format.
 
+        Repeated queries are served from an LRU cache; each call returns
+        its own copy, so callers are free to modify the result.
+
         Args:
             query: Raw search query string
             expand: Override expansion setting for this parse
@@ -314,189 +516,297 @@ class QueryParser:
         Returns:
             ParsedQuery object with structured data
         """
+        should_expand = bool(expand if expand is not None else self.enable_expansion)
+        key = (query, should_expand)
+        cached = self._parse_cache.get(key)
+        if cached is None:
+            cached = self._parse_uncached(query, should_expand)
+            self._parse_cache[key] = cached
+            if len(self._parse_cache) > self.PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+        else:
+            self._parse_cache.move_to_end(key)
+        return cached._copy()
+
+    @staticmethod
+    def _starts_proximity(operator_re, text: str, pos: int) -> bool:
+        """Whether a "phrase"~N proximity operator starts at pos."""
+        m = operator_re.match(text, pos)
+        return m is not None and m.lastgroup == 'proximity'
+
+    def _parse_uncached(self, query: str, should_expand: bool) -> ParsedQuery:
+        """Run the full parse pipeline for one query."""
         result = ParsedQuery(original=query)
         working_query = query.strip()
 
-        # Extract proximity searches first "phrase"~N
-        proximity_matches = re.findall(self.PHRASE_PROXIMITY_PATTERN, working_query)
-        for phrase, distance in proximity_matches:
-            result.proximity_searches.append((phrase, int(distance)))
-        working_query = re.sub(self.PHRASE_PROXIMITY_PATTERN, '', working_query)
-
-        # Extract regular phrases (quoted strings)
-        phrases = re.findall(self.PHRASE_PATTERN, working_query)
-        result.phrases = phrases
-        working_query = re.sub(self.PHRASE_PATTERN, '', working_query)
-
-        # Extract boost operators term^N
-        boost_matches = re.findall(self.BOOST_PATTERN, working_query)
-        for term, boost in boost_matches:
-            result.boosted_terms.append((term, float(boost)))
-        working_query = re.sub(self.BOOST_PATTERN, '', working_query)
-
-        # Extract wildcards
-        wildcards = re.findall(self.WILDCARD_PATTERN, working_query)
-        result.wildcard_terms = wildcards
-        # Don't remove wildcards, let them pass through as terms
-
-        # Extract site filter
-        site_match = re.search(self.SITE_PATTERN, working_query)
-        if site_match:
-            result.site_filter = site_match.group(1)
-            working_query = re.sub(self.SITE_PATTERN, '', working_query)
-
-        # Extract filetype filter
-        filetype_match = re.search(self.FILETYPE_PATTERN, working_query)
-        if filetype_match:
-            result.filetype_filter = filetype_match.group(1)
-            working_query = re.sub(self.FILETYPE_PATTERN, '', working_query)
-
-        # Extract date filters
-        after_match = re.search(self.DATE_AFTER_PATTERN, working_query)
-        if after_match:
-            result.date_after = after_match.group(1)
-            working_query = re.sub(self.DATE_AFTER_PATTERN, '', working_query)
-
-        before_match = re.search(self.DATE_BEFORE_PATTERN, working_query)
-        if before_match:
-            result.date_before = before_match.group(1)
-            working_query = re.sub(self.DATE_BEFORE_PATTERN, '', working_query)
-
-        # Extract intitle
-        intitle_match = re.search(self.INTITLE_PATTERN, working_query)
-        if intitle_match:
-            result.required_terms.append(f"intitle:{intitle_match.group(1)}")
-            working_query = re.sub(self.INTITLE_PATTERN, '', working_query)
-
-        # Extract inurl
-        inurl_match = re.search(self.INURL_PATTERN, working_query)
-        if inurl_match:
-            result.required_terms.append(f"inurl:{inurl_match.group(1)}")
-            working_query = re.sub(self.INURL_PATTERN, '', working_query)
+        # Single left-to-right scan over all operators; the text between
+        # matches is kept as the residual for term processing. Filters keep
+        # their first occurrence, later repeats are still stripped.
+        residual = []
+        pos = 0
+        intitle = inurl = None
+        phrases = {}
+        proximity_searches = []
+        boosted_terms = []
+        site_spans = []
+        filetype_spans = []
+        # RE2's \w, \d and \s are ASCII-only, so it is used only for ASCII
+        # queries, where both engines agree
+        use_re2 = RE2_AVAILABLE and working_query.isascii()
+        operator_re = self.OPERATOR_RE2 if use_re2 else self.OPERATOR_RE
+        search_from = 0
+        while True:
+            m = operator_re.search(working_query, search_from)
+            if m is None:
+                break
+            kind = m.lastgroup
+            if kind == 'phrase' and self._starts_proximity(operator_re, working_query, m.end() - 1):
+                # An unbalanced quote before "a b"~N: proximity wins, as
+                # when it was extracted first, so the opening quote is plain
+                # text and scanning resumes right after it
+                search_from = m.start() + 1
+                continue
+            residual.append(working_query[pos:m.start()])
+            pos = search_from = m.end()
+            if kind == 'proximity':
+                proximity_searches.append(
+                    (m.group('prox_phrase'), int(m.group('prox_dist'))))
+            elif kind == 'phrase':
+                phrases[sys.intern(m.group('phrase_text'))] = None
+            elif kind == 'boost':
+                boosted_terms.append(
+                    (sys.intern(m.group('boost_term')), float(m.group('boost_value'))))
+            elif kind == 'site':
+                value = m.group('site_value')
+                if result.site_filter is None:
+                    result.site_filter = value
+                if value == result.site_filter:
+                    site_spans.append(m.span())
+            elif kind == 'filetype':
+                value = m.group('filetype_value')
+                if result.filetype_filter is None:
+                    result.filetype_filter = value
+                if value == result.filetype_filter:
+                    filetype_spans.append(m.span())
+            elif kind == 'after':
+                if result.date_after is None:
+                    result.date_after = m.group('after_value')
+            elif kind == 'before':
+                if result.date_before is None:
+                    result.date_before = m.group('before_value')
+            elif kind == 'intitle':
+                if intitle is None:
+                    intitle = m.group('intitle_value')
+            elif kind == 'inurl':
+                if inurl is None:
+                    inurl = m.group('inurl_value')
+        residual.append(working_query[pos:])
+        working_query = ''.join(residual)
+        result.phrases = list(phrases)
+        result.proximity_searches = proximity_searches or None
+        if site_spans or filetype_spans:
+            # Spans are relative to the stripped query; shift them back
+            lead = len(query) - len(query.lstrip())
+            result._filter_spans = {
+                'site': tuple((a + lead, b + lead) for a, b in site_spans),
+                'filetype': tuple((a + lead, b + lead) for a, b in filetype_spans),
+            }
+        result.boosted_terms = boosted_terms or None
+
+        # Wildcards are only recorded; they pass through as terms. Most
+        # queries have neither * nor ?, so skip the regex for those.
+        if '*' in working_query or '?' in working_query:
+            wildcard_re = self.WILDCARD_RE2 if use_re2 else self.WILDCARD_RE
+            result.wildcard_terms = wildcard_re.findall(working_query) or None
+
+        if intitle is not None:
+            result.required_terms.append(f"intitle:{intitle}")
+        if inurl is not None:
+            result.required_terms.append(f"inurl:{inurl}")
 
         # Process remaining terms
         self._process_terms(working_query, result)
 
         # Apply query expansion if enabled
-        should_expand = expand if expand is not None else self.enable_expansion
         if should_expand and self.expander:
             expansions = self.expander.expand_query(result.required_terms)
-            result.expanded_terms = expansions
+            result.expanded_terms = expansions or None
 
         return result
 
     def _process_terms(self, query: str, result: ParsedQuery):
         """Process individual terms and operators."""
-        # Normalize operators in query
-        query = query.replace('&&', ' AND ')
-        query = query.replace('||', ' OR ')
-        query = query.replace('!', ' NOT ')
+        # Normalize operators in query (one pass for all three)
+        query = _OP_NORM_RE.sub(lambda m: _OP_NORM[m.group()], query)
 
         # Tokenize
         tokens = self._tokenize(query)
 
+        # Terms are interned: the same words recur across queries and are
+        # hashed again downstream. Insertion-ordered dicts collect them so
+        # repeated terms are kept once, in first-seen order.
+        required = dict.fromkeys(result.required_terms)
+        excluded = {}
+
+        def add_required(term: str):
+            required[sys.intern(term)] = None
+
+        def add_excluded(term: str):
+            excluded[sys.intern(term)] = None
+
+        # Single left-to-right pass. A plain term outside an OR group is held
+        # in pending until the next token shows whether it opens a group.
         exclude_next = False
         or_mode = False
+        pending = None
         current_or_group = []
+        or_groups = []
 
-        for i, token in enumerate(tokens):
-            token_upper = token.upper()
+        for token in tokens:
+            code = _OP_CODES_CI.get(token, _TERM)
 
-            # Check for operators
-            if token_upper in ('NOT',):
+            if pending is not None:
+                if code == _OR:
+                    current_or_group.append(pending)
+                else:
+                    add_required(pending)
+                pending = None
+
+            if code == _TERM:
+                # Regular term (the common case, so it is dispatched first)
+                if token.startswith('-'):
+                    add_excluded(token[1:])
+                elif token.startswith('+'):
+                    add_required(token[1:])
+                elif exclude_next:
+                    add_excluded(token)
+                    exclude_next = False
+                elif or_mode or current_or_group:
+                    # Add to current OR group
+                    current_or_group.append(sys.intern(token))
+                else:
+                    pending = sys.intern(token)
+
+            elif code == _NOT:
                 exclude_next = True
-                continue
 
-            if token_upper in ('AND', '&', '+'):
+            elif code == _AND:
                 # AND is implicit - if we were in OR mode, close the group
                 if current_or_group:
                     if len(current_or_group) > 1:
-                        result.or_groups.append(current_or_group)
+                        or_groups.append(current_or_group)
                     else:
-                        result.required_terms.extend(current_or_group)
+                        add_required(current_or_group[0])
                     current_or_group = []
                 or_mode = False
-                continue
 
-            if token_upper in ('OR', '|'):
+            else:
                 # OR handling - start/continue OR group
                 or_mode = True
-                continue
-
-            # Regular term
-            if token.startswith('-'):
-                result.excluded_terms.append(token[1:])
-            elif token.startswith('+'):
-                result.required_terms.append(token[1:])
-            elif exclude_next:
-                result.excluded_terms.append(token)
-                exclude_next = False
-            elif or_mode or current_or_group:
-                # Add to current OR group
-                current_or_group.append(token)
-            else:
-                # Check if next token is OR
-                if i + 1 < len(tokens) and tokens[i + 1].upper() in ('OR', '|'):
-                    current_or_group.append(token)
-                else:
-                    result.required_terms.append(token)
 
-        # Close any remaining OR group
+        # Flush the last held term and close any remaining OR group
+        if pending is not None:
+            add_required(pending)
         if current_or_group:
             if len(current_or_group) > 1:
-                result.or_groups.append(current_or_group)
+                or_groups.append(current_or_group)
             else:
-                result.required_terms.extend(current_or_group)
+                add_required(current_or_group[0])
+        if or_groups:
+            result.or_groups = or_groups
+        result.required_terms = list(required)
+        result.excluded_terms = list(excluded)
 
     def _tokenize(self, query: str) -> List[str]:
-        """Split query into tokens."""
-        # Replace multiple spaces with single space
-        query = re.sub(r'\s+', ' ', query).strip()
-
-        tokens = []
-        current_token = ""
-
-        i = 0
-        while i < len(query):
-            char = query[i]
-
-            if char == ' ':
-                if current_token:
-                    tokens.append(current_token)
-                    current_token = ""
-            elif char in ('+', '-') and (not current_token or current_token.isspace()):
-                # Operator at start of token
-                current_token = char
-            else:
-                current_token += char
+        """Split query into whitespace-delimited tokens (leading +/- kept)."""
+        return query.split()
 
-            i += 1
+    def compile_template(self, template: str) -> Callable[[str], ParsedQuery]:
+        """
+        Build a parser specialized for queries of one fixed shape.
 
-        if current_token and current_token.strip():
-            tokens.append(current_token.strip())
+        The template is made of {terms}, {site}, {filetype}, {after} and
+        {before} placeholders separated by whitespace, each filter written
+        with its operator, e.g. "{terms} site:{site} filetype:{filetype}".
+        Matching queries whose terms are plain words skip the generic
+        pipeline; any other query falls back to parse().
 
-        return [t for t in tokens if t and t.strip()]
+        Args:
+            template: Query shape
 
-    def suggest_refinements(self, query: str, results_count: int) -> List[str]:
+        Returns:
+            Function mapping a query string to a ParsedQuery
+        """
+        pattern = []
+        seen = set()
+        pos = 0
+        for m in _TEMPLATE_FIELD_RE.finditer(template):
+            name = m.group(1)
+            if name not in _TEMPLATE_FIELDS or name in seen:
+                raise ValueError(f"Unknown or repeated template field: {{{name}}}")
+            seen.add(name)
+            prefix, value_re = _TEMPLATE_FIELDS[name]
+            gap = template[pos:m.start()]
+            if not gap.endswith(prefix) or gap[:len(gap) - len(prefix)].strip():
+                raise ValueError(f"Unsupported text before {{{name}}}: {gap!r}")
+            pattern.append(r'\s+' if pattern else r'\s*')
+            pattern.append(f"{re.escape(prefix)}(?P<{name}>{value_re})")
+            pos = m.end()
+        if not pattern or template[pos:].strip():
+            raise ValueError(f"Unsupported query template: {template!r}")
+        pattern.append(r'\s*')
+        shape_re = re.compile("".join(pattern))
+
+        parse = self.parse
+        expander = self.expander if self.enable_expansion else None
+
+        def parse_template(query: str) -> ParsedQuery:
+            m = shape_re.fullmatch(query)
+            if m is None:
+                return parse(query)
+            fields = m.groupdict()
+            terms = (fields.get('terms') or '').split()
+            for term in terms:
+                if term in _OP_CODES_CI or not _PLAIN_TERM_RE.fullmatch(term):
+                    return parse(query)
+            required = list(dict.fromkeys(map(sys.intern, terms)))
+            return ParsedQuery(
+                original=query,
+                required_terms=required,
+                site_filter=fields.get('site'),
+                filetype_filter=fields.get('filetype'),
+                date_after=fields.get('after'),
+                date_before=fields.get('before'),
+                expanded_terms=(expander.expand_query(required) or None) if expander else None,
+            )
+
+        return parse_template
+
+    def suggest_refinements(self, query: str, results_count: int,
+                            parsed: Optional[ParsedQuery] = None) -> List[str]:
         """
         Suggest query refinements based on results.
 
         Args:
             query: Original query
             results_count: Number of results found
+            parsed: The caller's parse of query, to avoid parsing it again
 
         Returns:
             List of suggested refined queries
         """
         suggestions = []
-        parsed = self.parse(query)
+        if parsed is None:
+            parsed = self.parse(query)
 
         if results_count == 0:
             # Too restrictive - suggest removing filters
             if parsed.site_filter:
-                suggestions.append(f"Remove site filter: {query.replace(f'site:{parsed.site_filter}', '').strip()}")
+                suggestions.append(
+                    f"Remove site filter: {_remove_filter(query, parsed, 'site', parsed.site_filter)}")
             if parsed.filetype_filter:
-                suggestions.append(f"Remove filetype filter: {query.replace(f'filetype:{parsed.filetype_filter}', '').strip()}")
+                suggestions.append(
+                    f"Remove filetype filter: {_remove_filter(query, parsed, 'filetype', parsed.filetype_filter)}")
             if parsed.excluded_terms:
                 for term in parsed.excluded_terms:
                     suggestions.append(f"Remove exclusion of '{term}'")
@@ -515,6 +825,20 @@ class QueryParser:
         return suggestions
 
 
+def _remove_filter(query: str, parsed: ParsedQuery, name: str, value: str) -> str:
+    """Return query without its name:value filter, using the spans recorded by parse()."""
+    spans = parsed._filter_spans.get(name) if parsed._filter_spans else None
+    if not spans or parsed.original != query:
+        return query.replace(f'{name}:{value}', '').strip()
+    parts = []
+    pos = 0
+    for start, end in spans:
+        parts.append(query[pos:start])
+        pos = end
+    parts.append(query[pos:])
+    return ''.join(parts).strip()
+
+
 def format_query_for_display(parsed: ParsedQuery) -> str:
     """Format parsed query for display."""
     lines = [f"Original: {parsed.original}"]
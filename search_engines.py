@@ -3,15 +3,63 @@ Search Engines Module for Web Search Pro
 Handles both clearnet (WWW) and darknet (Tor) searches.
 """
 import asyncio
+import copy
+import functools
+import heapq
+import html
+import itertools
+import json
+import logging
+import operator
 import random
 import re
+import threading
 import time
+import weakref
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Callable
-from urllib.parse import urlencode, quote_plus
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Callable, Iterator, Mapping, NamedTuple, Tuple, Union
+from urllib.parse import urlencode, urlsplit, quote_plus, unquote
 
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# selectolax's lexbor parser is much faster than bs4+lxml for CSS selection
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# What selectolax raises for a selector it cannot handle (older releases
+# raise ValueError, newer ones their own SelectolaxError)
+_SELECTOLAX_ERRORS: Tuple[type, ...] = (ValueError,)
+if SELECTOLAX_AVAILABLE:
+    try:
+        from selectolax.lexbor import SelectolaxError
+        _SELECTOLAX_ERRORS += (SelectolaxError,)
+    except ImportError:
+        pass
+
+# orjson decodes API responses several times faster than the json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# msgspec decodes the JSON APIs straight into typed structs, skipping dicts
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
 
 try:
     import aiohttp
@@ -22,680 +70,1142 @@ except ImportError:
 
 from config import (
     TOR_SOCKS_HOST, TOR_SOCKS_PORT, DEFAULT_TIMEOUT,
-    USER_AGENTS, REQUEST_DELAY, MAX_RESULTS_PER_ENGINE
+    USER_AGENTS, REQUEST_DELAY, MAX_RESULTS_PER_ENGINE, SEARCH_CACHE_TTL,
+    MAX_REQUESTS_PER_HOST
 )
 
+logger = logging.getLogger(__name__)
+
+# Headers sent with every request (the User-Agent is chosen per request).
+# Read-only, since the sessions built from it are shared across threads.
+DEFAULT_HEADERS = MappingProxyType({
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+})
+
+
+def _new_http_session() -> requests.Session:
+    """Create a pooled requests session (used by every engine's sync path)."""
+    session = requests.Session()
+    # Retry failed connection setup briefly; read errors (a read timeout can
+    # take DEFAULT_TIMEOUT) and HTTP error statuses are not retried
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64,
+                          max_retries=Retry(total=2, connect=2, read=0, backoff_factor=0.3))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+# One connection pool for all engines, so keep-alive connections are reused
+# across engines and searches
+_HTTP_SESSION = _new_http_session()
+
+
+# User-Agent rotation: a shuffled cycle, drawn per request
+_UA_POOL = itertools.cycle(random.sample(USER_AGENTS, len(USER_AGENTS)))
+
+
+def _new_client_session(use_tor: bool = False) -> 'aiohttp.ClientSession':
+    """
+    Create the aiohttp session that engines in one search fan-out share.
+
+    Tor sessions route through a SOCKS connector (rdns so .onion names are
+    resolved by Tor), which keeps the SOCKS-wrapped connections pooled.
+    """
+    if use_tor:
+        connector = ProxyConnector.from_url(
+            f"socks5://{TOR_SOCKS_HOST}:{TOR_SOCKS_PORT}", rdns=True,
+            limit=100, limit_per_host=10)
+    else:
+        # Cache DNS answers well beyond aiohttp's 10s default; engines that
+        # share a host (Bing/Ecosia) also share its keep-alive connections
+        connector = aiohttp.TCPConnector(limit=100, limit_per_host=10,
+                                         ttl_dns_cache=300, keepalive_timeout=30)
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT),
+        headers=DEFAULT_HEADERS,
+    )
+
+
+# Per event loop, one semaphore per host bounding concurrent async requests
+_HOST_LIMITS: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]' = \
+    weakref.WeakKeyDictionary()
+
+
+def _host_limit(url: str) -> asyncio.Semaphore:
+    """Semaphore bounding concurrent requests to url's host on the running loop."""
+    limits = _HOST_LIMITS.setdefault(asyncio.get_running_loop(), {})
+    host = urlsplit(url).hostname or ""
+    limit = limits.get(host)
+    if limit is None:
+        limit = limits[host] = asyncio.Semaphore(MAX_REQUESTS_PER_HOST)
+    return limit
+
+
+def _by_relevance(results: List['SearchResult'],
+                  top_k: Optional[int] = None) -> List['SearchResult']:
+    """
+    Results by descending relevance. With top_k, only the top_k best are
+    kept, selected with a heap instead of sorting the whole list.
+    """
+    key = operator.attrgetter("relevance")
+    if top_k is None:
+        results.sort(key=key, reverse=True)
+        return results
+    return heapq.nlargest(top_k, results, key=key)
+
+
+def _in_event_loop() -> bool:
+    """Whether the calling thread is running an asyncio event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _loads_json(body: Union[str, bytes]) -> Any:
+    """Decode a JSON response body (orjson when installed)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _json_object(body: Union[str, bytes]) -> Dict[str, Any]:
+    """Decode a JSON API body, treating non-JSON or non-object bodies as empty."""
+    try:
+        data = _loads_json(body)
+    except ValueError:
+        # Not JSON (error page or truncated body)
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+@functools.lru_cache(maxsize=32)
+def _relevances(max_results: int) -> Tuple[float, ...]:
+    """Rank-based relevance of each result position (1.0 for the first)."""
+    return tuple(1.0 - (i / max_results) for i in range(max_results))
+
+
+def _query_pairs(params: Optional[Dict]) -> List[Tuple[str, str]]:
+    """Flatten request params (list values repeat the key) for aiohttp."""
+    pairs = []
+    for key, value in (params or {}).items():
+        for v in (value if isinstance(value, (list, tuple)) else (value,)):
+            pairs.append((key, str(v)))
+    return pairs
+
+
+def _select_nodes(body: str, *selectors: str,
+                  strainer: Optional[SoupStrainer] = None,
+                  limit: Optional[int] = None) -> list:
+    """
+    Parse an HTML body and return the nodes matching the first selector
+    that matches anything (at most limit of them).
+
+    Uses selectolax when installed, falling back to BeautifulSoup if it is
+    missing or rejects a selector; read the nodes with _first/_text/_attr, which work
+    with either parser. With BeautifulSoup, a strainer limits the tree to
+    the result containers so the rest of the page is never built, and
+    selection stops once limit nodes have matched.
+    """
+    if SELECTOLAX_AVAILABLE:
+        try:
+            tree = LexborHTMLParser(body)
+            for selector in selectors:
+                nodes = tree.css(selector)
+                if nodes:
+                    return nodes[:limit]
+            return []
+        except _SELECTOLAX_ERRORS as e:
+            logger.debug("selectolax failed (%s); parsing with BeautifulSoup", e)
 
-class SearchResult:
-    """Represents a single search result."""
+    soup = BeautifulSoup(body, "lxml", parse_only=strainer)
+    for selector in selectors:
+        nodes = soup.select(selector, limit=limit or None)
+        if nodes:
+            return nodes
+    return []
 
-    def __init__(self, title: str, url: str, snippet: str = "",
-                 engine: str = "", relevance: float = 0.0):
-        self.title = title
-        self.url = url
-        self.snippet = snippet
-        self.engine = engine
-        self.relevance = relevance
-        self.timestamp = time.time()
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "title": self.title,
-            "url": self.url,
-            "snippet": self.snippet,
-            "engine": self.engine,
-            "relevance": self.relevance,
-            "timestamp": self.timestamp
-        }
+def _class_strainer(name: Optional[str], *classes: str) -> SoupStrainer:
+    """
+    SoupStrainer for elements carrying any of the given CSS classes.
 
+    While parsing, the class attribute is matched as raw text, so a plain
+    class_="x" would miss elements that have several classes.
+    """
+    pattern = re.compile(r'(?:^|\s)(?:%s)(?:\s|$)' % "|".join(map(re.escape, classes)))
+    return SoupStrainer(name, class_=pattern)
 
-class BaseSearchEngine(ABC):
-    """Abstract base class for search engines."""
 
-    def __init__(self, name: str, base_url: str):
-        self.name = name
-        self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": random.choice(USER_AGENTS),
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-        })
+# Markup tags, removed when taking the text of a raw HTML fragment
+_TAG_RE = re.compile(r'<[^>]+>')
 
-    def _get_user_agent(self) -> str:
-        return random.choice(USER_AGENTS)
 
-    @abstractmethod
-    def search(self, query: str, max_results: int = 20,
-               progress_callback: Optional[Callable] = None) -> List[SearchResult]:
-        """Execute search and return results."""
-        pass
+def _class_re(name: str) -> str:
+    """Regex source matching a class="..." attribute that contains class name."""
+    return r'class="(?:[^"]*\s)?%s(?:\s[^"]*)?"' % re.escape(name)
 
-    def _make_request(self, url: str, params: Dict = None,
-                      use_tor: bool = False) -> Optional[requests.Response]:
-        """Make HTTP request with optional Tor proxy."""
-        try:
-            proxies = None
-            if use_tor:
-                proxies = {
-                    "http": f"socks5h://{TOR_SOCKS_HOST}:{TOR_SOCKS_PORT}",
-                    "https": f"socks5h://{TOR_SOCKS_HOST}:{TOR_SOCKS_PORT}"
-                }
 
-            self.session.headers["User-Agent"] = self._get_user_agent()
-            response = self.session.get(
-                url,
-                params=params,
-                proxies=proxies,
-                timeout=DEFAULT_TIMEOUT,
-                verify=not use_tor  # Skip SSL verification for .onion
-            )
-            response.raise_for_status()
-            return response
-        except Exception as e:
-            raise SearchError(f"Request failed: {str(e)}")
+@functools.lru_cache(maxsize=None)
+def _tag_edge_re(tag: str) -> 're.Pattern':
+    """Regex matching the start and end tags of element tag (group 1 is "/" on end tags)."""
+    return re.compile(r'<(/?)%s\b[^>]*>' % re.escape(tag), re.I)
 
 
-class SearchError(Exception):
-    """Custom exception for search errors."""
-    pass
+def _element_end(body: str, start: int, tag: str) -> int:
+    """
+    Index just past the end tag closing the tag element that opens at start
+    (nested elements of the same name are skipped); len(body) if unclosed.
+    """
+    depth = 0
+    for m in _tag_edge_re(tag).finditer(body, start):
+        if m.group(1):
+            depth -= 1
+            if depth <= 0:
+                return m.end()
+        elif not m.group(0).endswith('/>'):
+            depth += 1
+    return len(body)
 
 
-# ============= CLEARNET SEARCH ENGINES =============
+def _strip_tags(text: str) -> str:
+    """Remove markup tags (plain text is returned without running the regex)."""
+    return _TAG_RE.sub('', text) if '<' in text else text
 
-class DuckDuckGoSearch(BaseSearchEngine):
-    """DuckDuckGo HTML search engine."""
 
-    def __init__(self):
-        super().__init__("DuckDuckGo", "https://html.duckduckgo.com/html/")
+def _fragment_text(fragment: str) -> str:
+    """Text of a raw HTML fragment (tags removed, entities decoded)."""
+    return html.unescape(_strip_tags(fragment)).strip()
 
-    def search(self, query: str, max_results: int = 20,
-               progress_callback: Optional[Callable] = None) -> List[SearchResult]:
-        results = []
 
-        if progress_callback:
-            progress_callback(self.name, "starting", "Initiating search...")
+class Selectors(NamedTuple):
+    """CSS selectors of a standard results page (alternatives are tried in order)."""
+    result: Tuple[str, ...]
+    title: Tuple[str, ...]
+    snippet: Tuple[str, ...]
+    # Element whose href is the result URL (defaults to the title link)
+    url: Tuple[str, ...] = ()
 
-        try:
-            response = self._make_request(self.base_url, params={"q": query})
-            if not response:
-                return results
 
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing results...")
+def _first(node, selector: str):
+    """First descendant of node matching a CSS selector, or None."""
+    if isinstance(node, Tag):
+        return node.select_one(selector)
+    return node.css_first(selector)
 
-            soup = BeautifulSoup(response.text, "lxml")
-            result_divs = soup.select(".result")
 
-            for i, div in enumerate(result_divs[:max_results]):
-                title_elem = div.select_one(".result__a")
-                snippet_elem = div.select_one(".result__snippet")
-                url_elem = div.select_one(".result__url")
+def _first_of(node, selectors: Tuple[str, ...]):
+    """First descendant matching the first selector that matches, or None."""
+    for selector in selectors:
+        found = _first(node, selector)
+        if found:
+            return found
+    return None
 
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    url = title_elem.get("href", "")
 
-                    # DuckDuckGo uses redirect URLs, extract actual URL
-                    if "uddg=" in url:
-                        url_match = re.search(r"uddg=([^&]+)", url)
-                        if url_match:
-                            from urllib.parse import unquote
-                            url = unquote(url_match.group(1))
+def _text(node) -> str:
+    """Stripped text content of a node."""
+    if isinstance(node, Tag):
+        return node.get_text(strip=True)
+    return node.text(strip=True)
 
-                    snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
 
-                    results.append(SearchResult(
-                        title=title,
-                        url=url,
-                        snippet=snippet,
-                        engine=self.name,
-                        relevance=1.0 - (i / max_results)
-                    ))
+def _attr(node, name: str) -> str:
+    """Attribute value of a node ("" when absent)."""
+    if isinstance(node, Tag):
+        return node.get(name, "")
+    return node.attributes.get(name) or ""
 
-                if progress_callback and (i + 1) % 5 == 0:
-                    progress_callback(self.name, "progress",
-                                     f"Processed {i + 1}/{len(result_divs[:max_results])} results")
 
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} results")
+def _xp_class(name: str) -> str:
+    """XPath predicate for "element has CSS class name"."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
 
-        except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
-            raise SearchError(f"DuckDuckGo search failed: {e}")
 
-        return results
+def _xpath(expr: str) -> 'etree.XPath':
+    """Compile an XPath expression that returns plain str results."""
+    return etree.XPath(expr, smart_strings=False)
 
 
-class BingSearch(BaseSearchEngine):
-    """Bing search engine."""
+def _xpath_rows(body: str, row_xpath: 'etree.XPath', field_xpaths: Tuple['etree.XPath', ...],
+                limit: int) -> List[tuple]:
+    """
+    Extract one tuple of field values per result row with precompiled XPaths.
 
-    def __init__(self):
-        super().__init__("Bing", "https://www.bing.com/search")
+    row_xpath takes a $limit variable and returns at most that many rows.
 
-    def search(self, query: str, max_results: int = 20,
-               progress_callback: Optional[Callable] = None) -> List[SearchResult]:
-        results = []
+    The whole page is walked by libxml2, with no per-node Python objects
+    beyond the rows themselves.
+    """
+    try:
+        doc = lxml.html.fromstring(body)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        doc = lxml.html.fromstring(body.encode("utf-8"))
+    except etree.ParserError:
+        # Empty document
+        return []
+    return [tuple(field(row) for field in field_xpaths) for row in row_xpath(doc, limit=limit)]
 
-        if progress_callback:
-            progress_callback(self.name, "starting", "Initiating search...")
 
-        try:
-            response = self._make_request(self.base_url, params={"q": query})
-            if not response:
-                return results
+class SearchResult:
+    """Represents a single search result."""
 
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing results...")
+    # No per-instance __dict__: a search creates engines x max_results of these
+    __slots__ = ("title", "url", "snippet", "engine", "relevance", "timestamp")
 
-            soup = BeautifulSoup(response.text, "lxml")
-            result_items = soup.select("li.b_algo")
+    def __init__(self, title: str, url: str, snippet: str = "",
+                 engine: str = "", relevance: float = 0.0):
+        self.title = title
+        self.url = url
+        self.snippet = snippet
+        self.engine = engine
+        self.relevance = relevance
+        self.timestamp = time.time()
 
-            for i, item in enumerate(result_items[:max_results]):
-                title_elem = item.select_one("h2 a")
-                snippet_elem = item.select_one(".b_caption p")
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "title": self.title,
+            "url": self.url,
+            "snippet": self.snippet,
+            "engine": self.engine,
+            "relevance": self.relevance,
+            "timestamp": self.timestamp
+        }
 
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    url = title_elem.get("href", "")
-                    snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
 
-                    results.append(SearchResult(
-                        title=title,
-                        url=url,
-                        snippet=snippet,
-                        engine=self.name,
-                        relevance=1.0 - (i / max_results)
-                    ))
+class _TTLCache:
+    """
+    Thread-safe LRU map of search results that expire after a fixed TTL.
+
+    Holds at most maxsize entries; the least recently used is evicted first.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 512):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: 'OrderedDict[Tuple, Tuple[float, List[SearchResult]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[List['SearchResult']]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Tuple, results: List['SearchResult']):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, results)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def _query_key(query: str) -> str:
+    """
+    Cache key of a query, ignoring surrounding and repeated whitespace.
+    Case is kept: operators such as OR/AND are case-sensitive.
+    """
+    return " ".join(query.split())
+
+
+def _ttl_cached(method):
+    """
+    Memoize an engine's search()/search_async() in BaseSearchEngine.cache.
+
+    Hits skip the request and the parse; callers get copies of the cached
+    results, since they may edit them (e.g. translation). Empty result
+    lists are not cached, as they are usually a failed request.
+    """
+    def lookup(self, query, max_results, progress_callback):
+        key = (self.name, _query_key(query), max_results)
+        cached = self.cache.get(key) if self.cache.ttl > 0 else None
+        if cached is not None and progress_callback:
+            progress_callback(self.name, "complete",
+                              self.COMPLETE_MESSAGE.format(count=len(cached)) + " (cached)")
+        return key, cached
+
+    def store(self, key, results):
+        if results and self.cache.ttl > 0:
+            self.cache.put(key, [copy.copy(r) for r in results])
+        return results
 
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} results")
+    if asyncio.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def wrapper(self, query, max_results=20, progress_callback=None, *args, **kwargs):
+            key, cached = lookup(self, query, max_results, progress_callback)
+            if cached is not None:
+                return [copy.copy(r) for r in cached]
+            return store(self, key, await method(self, query, max_results,
+                                                 progress_callback, *args, **kwargs))
+    else:
+        @functools.wraps(method)
+        def wrapper(self, query, max_results=20, progress_callback=None, *args, **kwargs):
+            key, cached = lookup(self, query, max_results, progress_callback)
+            if cached is not None:
+                return [copy.copy(r) for r in cached]
+            return store(self, key, method(self, query, max_results,
+                                           progress_callback, *args, **kwargs))
+    return wrapper
 
-        except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
-            raise SearchError(f"Bing search failed: {e}")
 
-        return results
+class BaseSearchEngine(ABC):
+    """
+    Abstract base class for search engines.
+
+    Subclasses describe their request (_build_request) and how to turn the
+    response body into results (_parse); search() and search_async() run
+    the same pipeline over requests or aiohttp.
+    """
+
+    # Progress messages reported through progress_callback
+    START_MESSAGE = "Initiating search..."
+    PARSE_MESSAGE = "Parsing results..."
+    COMPLETE_MESSAGE = "Found {count} results"
+    # Raise SearchError on failure (otherwise report it and return no results)
+    RAISE_ERRORS = False
+    # Extra per-request headers
+    HEADERS: Mapping[str, str] = MappingProxyType({})
+    # Standard HTML engines describe their page instead of overriding _parse:
+    # precompiled lxml XPaths (RESULT_XPATH, FIELD_XPATHS), or CSS SELECTORS
+    # plus the result containers to keep when parsing with BeautifulSoup
+    RESULT_XPATH: Optional['etree.XPath'] = None
+    FIELD_XPATHS: Tuple['etree.XPath', ...] = ()
+    SELECTORS: Optional[Selectors] = None
+    RESULT_STRAINER: Optional[SoupStrainer] = None
+    # Engine label ("{name}" is the engine name) and title prefix of results
+    ENGINE_LABEL = "{name}"
+    TITLE_PREFIX = ""
+    # Regex fast path for engines with very regular markup (see _iter_regex_rows);
+    # FAST_BLOCK_RE matches a result container's start tag, group 1 its name
+    FAST_BLOCK_RE: Optional['re.Pattern'] = None
+    FAST_TITLE_RE: Optional['re.Pattern'] = None
+    FAST_SNIPPET_RE: Optional['re.Pattern'] = None
+    FAST_URL_RE: Optional['re.Pattern'] = None
+    # Paginated engines: query parameter holding the page position and
+    # results per page; search() and search_async() fetch all needed pages
+    # at once
+    PAGE_PARAM: Optional[str] = None
+    PAGE_SIZE = 10
+    # JSON APIs parse the raw response bytes: orjson/msgspec decode UTF-8
+    # themselves, which skips building the text (and requests' charset
+    # detection when the server names no charset)
+    RAW_BODY = False
+    # search_async() parses bodies at least this large in a worker thread,
+    # so one big page does not stall the other engines' I/O in a fan-out
+    PARSE_OFFLOAD_BYTES = 64 * 1024
+    requires_tor = False
+    # Recent results shared by all engines, keyed by (engine, query, max_results)
+    cache = _TTLCache(SEARCH_CACHE_TTL)
+
+    def __init__(self, name: str, base_url: str,
+                 session: Optional[requests.Session] = None):
+        self.name = name
+        self.base_url = base_url
+        # Shared across engines and threads: per-request headers go through
+        # _request_headers(), never into session.headers
+        self.session = session or _HTTP_SESSION
 
+    def _get_user_agent(self) -> str:
+        return next(_UA_POOL)
 
-class BraveSearch(BaseSearchEngine):
-    """Brave Search engine."""
+    def _request_headers(self) -> Dict[str, str]:
+        """Headers for one request: a rotated User-Agent plus engine extras."""
+        return {"User-Agent": self._get_user_agent(), **self.HEADERS}
 
-    def __init__(self):
-        super().__init__("Brave", "https://search.brave.com/search")
+    @abstractmethod
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        """Return the (url, params) to fetch for a query."""
+        pass
 
-    def search(self, query: str, max_results: int = 20,
+    def _parse(self, body: str, max_results: int,
                progress_callback: Optional[Callable] = None) -> List[SearchResult]:
-        results = []
+        """Turn a response body into search results (standard HTML layout by default)."""
+        return self._parse_standard(body, max_results)
+
+    def _page_offset(self, page: int) -> int:
+        """PAGE_PARAM value of a 0-based page (1-based result index by default)."""
+        return 1 + page * self.PAGE_SIZE
 
+    @_ttl_cached
+    def search(self, query: str, max_results: int = 20,
+               progress_callback: Optional[Callable] = None) -> List[SearchResult]:
+        """Execute search and return results."""
         if progress_callback:
-            progress_callback(self.name, "starting", "Initiating search...")
+            progress_callback(self.name, "starting", self.START_MESSAGE)
 
         try:
-            response = self._make_request(self.base_url, params={"q": query})
-            if not response:
-                return results
-
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing results...")
-
-            soup = BeautifulSoup(response.text, "lxml")
-            result_items = soup.select(".snippet")
-
-            for i, item in enumerate(result_items[:max_results]):
-                title_elem = item.select_one(".snippet-title")
-                url_elem = item.select_one(".snippet-url")
-                snippet_elem = item.select_one(".snippet-description")
-
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    url = url_elem.get_text(strip=True) if url_elem else ""
-                    if not url.startswith("http"):
-                        url = "https://" + url
-                    snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
-
-                    results.append(SearchResult(
-                        title=title,
-                        url=url,
-                        snippet=snippet,
-                        engine=self.name,
-                        relevance=1.0 - (i / max_results)
-                    ))
-
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} results")
-
+            url, params = self._build_request(query, max_results)
+            if self.PAGE_PARAM and max_results > self.PAGE_SIZE:
+                return self._search_pages_sync(url, params, max_results, progress_callback)
+            response = self._make_request(url, params=params, use_tor=self.requires_tor)
+            body = response.content if self.RAW_BODY else response.text
+            return self._finish(body, max_results, progress_callback)
         except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
-            raise SearchError(f"Brave search failed: {e}")
+            return self._fail(e, progress_callback)
 
-        return results
+    def _search_pages_sync(self, url: str, params: Dict[str, Any], max_results: int,
+                           progress_callback: Optional[Callable]) -> List[SearchResult]:
+        """
+        _search_pages() for search(): the same pages, fetched concurrently on
+        threads (at most MAX_REQUESTS_PER_HOST at a time, as in the async
+        path). A failed first page fails the search; failed later pages only
+        shorten the results.
+        """
+        pages = -(-max_results // self.PAGE_SIZE)
+        with ThreadPoolExecutor(max_workers=min(pages, MAX_REQUESTS_PER_HOST)) as pool:
+            futures = [
+                pool.submit(self._make_request, url, self._page_params(params, page),
+                            self.requires_tor)
+                for page in range(pages)
+            ]
+        bodies = []
+        for page, future in enumerate(futures):
+            try:
+                bodies.append(future.result().text)
+            except SearchError:
+                if not page:
+                    raise
 
+        if progress_callback:
+            progress_callback(self.name, "parsing", self.PARSE_MESSAGE)
 
-# ============= DARKNET SEARCH ENGINES =============
+        parsed = [self._parse(body, self.PAGE_SIZE) for body in bodies]
+        return self._merge_pages(parsed, max_results, progress_callback)
 
-class AhmiaSearch(BaseSearchEngine):
-    """Ahmia.fi - Clearnet gateway to search Tor hidden services."""
+    @_ttl_cached
+    async def search_async(self, query: str, max_results: int = 20,
+                           progress_callback: Optional[Callable] = None,
+                           session: Optional['aiohttp.ClientSession'] = None) -> List[SearchResult]:
+        """
+        Asynchronous search().
 
-    def __init__(self):
-        super().__init__("Ahmia", "https://ahmia.fi/search/")
+        Args:
+            query: Search query
+            max_results: Max results
+            progress_callback: Callback for progress updates
+            session: aiohttp session to reuse (engines of one fan-out share it;
+                     Tor engines need one built with use_tor=True)
 
-    def search(self, query: str, max_results: int = 20,
-               progress_callback: Optional[Callable] = None) -> List[SearchResult]:
-        results = []
+        Returns:
+            List of search results
+        """
+        if not ASYNC_AVAILABLE:
+            # No aiohttp: run the blocking search in a worker thread
+            # (undecorated: the caller's cache entry covers this call)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, type(self).search.__wrapped__, self, query, max_results, progress_callback)
+
+        if session is None:
+            async with _new_client_session(self.requires_tor) as session:
+                return await type(self).search_async.__wrapped__(
+                    self, query, max_results, progress_callback, session)
 
         if progress_callback:
-            progress_callback(self.name, "starting", "Searching darknet index...")
+            progress_callback(self.name, "starting", self.START_MESSAGE)
 
         try:
-            response = self._make_request(self.base_url, params={"q": query})
-            if not response:
-                return results
-
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing darknet results...")
-
-            soup = BeautifulSoup(response.text, "lxml")
-            result_items = soup.select("li.result")
-
-            for i, item in enumerate(result_items[:max_results]):
-                title_elem = item.select_one("h4 a")
-                snippet_elem = item.select_one("p")
-                url_elem = item.select_one(".onion a")
-
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    url = url_elem.get("href", "") if url_elem else title_elem.get("href", "")
-                    snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
-
-                    results.append(SearchResult(
-                        title=title,
-                        url=url,
-                        snippet=snippet,
-                        engine=f"{self.name} (Darknet)",
-                        relevance=1.0 - (i / max_results)
-                    ))
+            url, params = self._build_request(query, max_results)
+            if self.PAGE_PARAM and max_results > self.PAGE_SIZE:
+                return await self._search_pages(session, url, params, max_results,
+                                                progress_callback)
+            body = await self._fetch(session, url, params=params, use_tor=self.requires_tor,
+                                     raw=self.RAW_BODY)
+            return await self._finish_async(body, max_results, progress_callback)
+        except Exception as e:
+            return self._fail(e, progress_callback)
 
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} darknet results")
+    async def _search_pages(self, session: 'aiohttp.ClientSession', url: str,
+                            params: Dict[str, Any], max_results: int,
+                            progress_callback: Optional[Callable]) -> List[SearchResult]:
+        """
+        Fetch every page needed for max_results concurrently and parse them
+        (large pages in worker threads, off the event loop). A failed first page fails the
+        search; failed later pages only shorten the results.
+        """
+        pages = -(-max_results // self.PAGE_SIZE)
+        bodies = await asyncio.gather(*(
+            self._fetch(session, url, params=self._page_params(params, page),
+                        use_tor=self.requires_tor)
+            for page in range(pages)
+        ), return_exceptions=True)
+        if isinstance(bodies[0], BaseException):
+            raise bodies[0]
 
-        except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
-            raise SearchError(f"Ahmia search failed: {e}")
+        if progress_callback:
+            progress_callback(self.name, "parsing", self.PARSE_MESSAGE)
+
+        parsed = await asyncio.gather(*(
+            self._parse_async(body, self.PAGE_SIZE)
+            for body in bodies if not isinstance(body, BaseException)
+        ))
+        return self._merge_pages(parsed, max_results, progress_callback)
+
+    def _page_params(self, params: Dict[str, Any], page: int) -> Dict[str, Any]:
+        """Request params for a 0-based page of results."""
+        return {**params, self.PAGE_PARAM: self._page_offset(page)}
+
+    def _merge_pages(self, parsed: List[List[SearchResult]], max_results: int,
+                     progress_callback: Optional[Callable]) -> List[SearchResult]:
+        """Join parsed pages in order and re-rank them (each page was ranked on its own)."""
+        results = list(itertools.islice(itertools.chain.from_iterable(parsed), max_results))
+        relevances = _relevances(max_results)
+        for i, result in enumerate(results):
+            result.relevance = relevances[i]
 
+        if progress_callback:
+            progress_callback(self.name, "complete",
+                              self.COMPLETE_MESSAGE.format(count=len(results)))
         return results
 
+    def _iter_regex_rows(self, body: str, max_results: int) -> Iterator[Tuple[str, str, str]]:
+        """
+        Yield (title, url, snippet) rows straight from the raw HTML.
+
+        Each result block runs from a FAST_BLOCK_RE match to the container's
+        closing tag (or the next match, if that comes first), so markup after
+        the last result is never read; the title link (groups: href, text),
+        snippet and optional URL patterns are searched within it. Yields nothing when nothing
+        matches, so callers can fall back to a real parse if the markup
+        changed.
+        """
+        if self.FAST_BLOCK_RE is None:
+            return
+
+        matches = list(itertools.islice(self.FAST_BLOCK_RE.finditer(body), max_results + 1))
+        next_starts = [m.start() for m in matches[1:]] + [len(body)]
+        count = 0
+        for match, next_start in zip(matches, next_starts):
+            start = match.start()
+            block = body[start:min(_element_end(body, start, match.group(1)), next_start)]
+            title_match = self.FAST_TITLE_RE.search(block)
+            if not title_match:
+                continue
 
-class TorchSearch(BaseSearchEngine):
-    """Torch - Tor network search engine (requires Tor)."""
-
-    def __init__(self):
-        super().__init__("Torch", "http://torchdeedp3i2jigzjdmfpn5ttjhthh5wbmda2rber7cqskosuh7vqid.onion/search")
-        self.requires_tor = True
+            url = title_match.group(1)
+            if self.FAST_URL_RE is not None:
+                url_match = self.FAST_URL_RE.search(block)
+                if url_match:
+                    url = url_match.group(1)
+            snippet_match = self.FAST_SNIPPET_RE.search(block)
+            snippet = _fragment_text(snippet_match.group(snippet_match.lastindex)) if snippet_match else ""
+
+            yield _fragment_text(title_match.group(2)), html.unescape(url), snippet
+            count += 1
+            if count == max_results:
+                return
+
+    def _iter_css_rows(self, body: str, max_results: int) -> Iterator[Tuple[str, str, str]]:
+        """Yield (title, url, snippet) rows via SELECTORS on a full parse."""
+        sels = self.SELECTORS
+        result_items = _select_nodes(body, *sels.result, strainer=self.RESULT_STRAINER,
+                                     limit=max_results)
+
+        for item in result_items:
+            title_elem = _first_of(item, sels.title)
+            if not title_elem:
+                continue
 
-    def search(self, query: str, max_results: int = 20,
-               progress_callback: Optional[Callable] = None) -> List[SearchResult]:
-        results = []
+            url_elem = _first_of(item, sels.url)
+            snippet_elem = _first_of(item, sels.snippet)
+            yield (
+                _text(title_elem),
+                _attr(url_elem, "href") if url_elem else _attr(title_elem, "href"),
+                _text(snippet_elem) if snippet_elem else "",
+            )
 
+    def _iter_rows(self, body: str, max_results: int) -> Iterator[Tuple[str, str, str]]:
+        """Yield (title, url, snippet) rows by the fastest extraction the engine defines."""
+        if self.RESULT_XPATH is not None:
+            for has_title, title, url, snippet in _xpath_rows(
+                    body, self.RESULT_XPATH, self.FIELD_XPATHS, max_results):
+                if has_title:
+                    yield title, url, snippet
+            return
+
+        rows = self._iter_regex_rows(body, max_results)
+        first = next(rows, None)
+        if first is None:
+            yield from self._iter_css_rows(body, max_results)
+            return
+        yield first
+        yield from rows
+
+    def _parse_standard(self, body: str, max_results: int) -> List[SearchResult]:
+        """Build ranked results from a standard results page."""
+        make_result = SearchResult
+        engine = self.ENGINE_LABEL.format(name=self.name)
+        prefix = self.TITLE_PREFIX
+        relevances = _relevances(max_results)
+        return [
+            make_result(title=prefix + title, url=url, snippet=snippet,
+                        engine=engine, relevance=relevances[i])
+            for i, (title, url, snippet) in enumerate(self._iter_rows(body, max_results))
+        ]
+
+    def _finish(self, body: Union[str, bytes], max_results: int,
+                progress_callback: Optional[Callable]) -> List[SearchResult]:
+        """Parse a fetched body, reporting progress around it."""
         if progress_callback:
-            progress_callback(self.name, "starting", "Connecting via Tor...")
+            progress_callback(self.name, "parsing", self.PARSE_MESSAGE)
 
-        try:
-            params = {"query": query, "action": "search"}
-            response = self._make_request(self.base_url, params=params, use_tor=True)
-            if not response:
-                return results
+        results = self._parse(body, max_results, progress_callback)
 
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing Torch results...")
+        if progress_callback:
+            progress_callback(self.name, "complete",
+                              self.COMPLETE_MESSAGE.format(count=len(results)))
+        return results
 
-            soup = BeautifulSoup(response.text, "lxml")
-            result_items = soup.select(".result")
+    async def _parse_async(self, body: Union[str, bytes], max_results: int,
+                           progress_callback: Optional[Callable] = None) -> List[SearchResult]:
+        """_parse() for the async path: large bodies are parsed in a worker thread."""
+        if len(body) < self.PARSE_OFFLOAD_BYTES:
+            return self._parse(body, max_results, progress_callback)
 
-            for i, item in enumerate(result_items[:max_results]):
-                title_elem = item.select_one("a")
-                snippet_elem = item.select_one("p")
+        if progress_callback:
+            # Deliver the worker's progress through the loop, so callbacks
+            # still run on the loop's thread (and before the parse returns)
+            loop = asyncio.get_running_loop()
+            callback = progress_callback
 
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    url = title_elem.get("href", "")
-                    snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
+            def progress_callback(*args):
+                loop.call_soon_threadsafe(callback, *args)
 
-                    results.append(SearchResult(
-                        title=title,
-                        url=url,
-                        snippet=snippet,
-                        engine=f"{self.name} (Tor)",
-                        relevance=1.0 - (i / max_results)
-                    ))
+        return await asyncio.to_thread(self._parse, body, max_results, progress_callback)
 
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} onion results")
+    async def _finish_async(self, body: Union[str, bytes], max_results: int,
+                            progress_callback: Optional[Callable]) -> List[SearchResult]:
+        """_finish() for the async path (see _parse_async)."""
+        if progress_callback:
+            progress_callback(self.name, "parsing", self.PARSE_MESSAGE)
 
-        except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
-            raise SearchError(f"Torch search failed: {e}")
+        results = await self._parse_async(body, max_results, progress_callback)
 
+        if progress_callback:
+            progress_callback(self.name, "complete",
+                              self.COMPLETE_MESSAGE.format(count=len(results)))
         return results
 
-
-class HaystackSearch(BaseSearchEngine):
-    """Haystack - Another Tor search engine."""
-
-    def __init__(self):
-        super().__init__("Haystack", "http://haystak5njsmn2hqkewecpaxetahtwhsbsa64jom2k22z5afxhnpxfid.onion/")
-        self.requires_tor = True
-
-    def search(self, query: str, max_results: int = 20,
-               progress_callback: Optional[Callable] = None) -> List[SearchResult]:
-        results = []
-
+    def _fail(self, error: Exception,
+              progress_callback: Optional[Callable]) -> List[SearchResult]:
+        """Report a failed search; raise or return no results per RAISE_ERRORS."""
         if progress_callback:
-            progress_callback(self.name, "starting", "Connecting via Tor to Haystack...")
+            progress_callback(self.name, "error", str(error))
+        if self.RAISE_ERRORS:
+            raise SearchError(f"{self.name} search failed: {error}")
+        return []
 
+    def _make_request(self, url: str, params: Dict = None,
+                      use_tor: bool = False) -> Optional[requests.Response]:
+        """Make HTTP request with optional Tor proxy."""
         try:
-            params = {"q": query}
-            response = self._make_request(self.base_url, params=params, use_tor=True)
-            if not response:
-                return results
+            proxies = None
+            if use_tor:
+                proxies = {
+                    "http": f"socks5h://{TOR_SOCKS_HOST}:{TOR_SOCKS_PORT}",
+                    "https": f"socks5h://{TOR_SOCKS_HOST}:{TOR_SOCKS_PORT}"
+                }
 
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing Haystack results...")
+            response = self.session.get(
+                url,
+                params=params,
+                headers=self._request_headers(),
+                proxies=proxies,
+                timeout=DEFAULT_TIMEOUT,
+                verify=not use_tor  # Skip SSL verification for .onion
+            )
+            response.raise_for_status()
+            return response
+        except Exception as e:
+            raise SearchError(f"Request failed: {str(e)}")
 
-            soup = BeautifulSoup(response.text, "lxml")
-            result_items = soup.select(".result")
+    async def _fetch(self, session: 'aiohttp.ClientSession', url: str,
+                     params: Dict = None, use_tor: bool = False,
+                     raw: bool = False) -> Union[str, bytes]:
+        """
+        Fetch a URL through an aiohttp session and return the body text
+        (or its bytes, with raw).
 
-            for i, item in enumerate(result_items[:max_results]):
-                title_elem = item.select_one("a")
-                snippet_elem = item.select_one("p, .description")
+        At most MAX_REQUESTS_PER_HOST requests to one host run at a time,
+        which keeps concurrent fan-outs polite without serializing hosts.
+        """
+        try:
+            async with _host_limit(url), \
+                    session.get(url, params=_query_pairs(params),
+                                headers=self._request_headers(),
+                                ssl=False if use_tor else None  # Skip SSL verification for .onion
+                                ) as response:
+                response.raise_for_status()
+                return await response.read() if raw else await response.text()
+        except Exception as e:
+            raise SearchError(f"Request failed: {str(e)}")
 
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    url = title_elem.get("href", "")
-                    snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
 
-                    results.append(SearchResult(
-                        title=title,
-                        url=url,
-                        snippet=snippet,
-                        engine=f"{self.name} (Tor)",
-                        relevance=1.0 - (i / max_results)
-                    ))
+class SearchError(Exception):
+    """Custom exception for search errors."""
+    pass
 
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} results")
 
-        except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
-            raise SearchError(f"Haystack search failed: {e}")
+# ============= CLEARNET SEARCH ENGINES =============
 
-        return results
+# Target URL parameter of DuckDuckGo's result redirect links
+_UDDG_RE = re.compile(r"uddg=([^&]+)")
 
 
-# ============= ADDITIONAL CLEARNET ENGINES =============
+class DuckDuckGoSearch(BaseSearchEngine):
+    """DuckDuckGo HTML search engine."""
 
-class YahooSearch(BaseSearchEngine):
-    """Yahoo search engine."""
+    SELECTORS = Selectors(result=(".result",), title=(".result__a",),
+                          snippet=(".result__snippet",))
+    RESULT_STRAINER = _class_strainer(None, "result")
+    RAISE_ERRORS = True
 
     def __init__(self):
-        super().__init__("Yahoo", "https://search.yahoo.com/search")
+        super().__init__("DuckDuckGo", "https://html.duckduckgo.com/html/")
 
-    def search(self, query: str, max_results: int = 20,
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {"q": query}
+
+    def _parse(self, body: str, max_results: int,
                progress_callback: Optional[Callable] = None) -> List[SearchResult]:
         results = []
+        relevances = _relevances(max_results)
+        sels = self.SELECTORS
+        result_divs = _select_nodes(body, *sels.result, strainer=self.RESULT_STRAINER,
+                                    limit=max_results)
+
+        for i, div in enumerate(result_divs):
+            title_elem = _first_of(div, sels.title)
+            snippet_elem = _first_of(div, sels.snippet)
+
+            if title_elem:
+                title = _text(title_elem)
+                url = _attr(title_elem, "href")
+
+                # DuckDuckGo uses redirect URLs, extract actual URL
+                if "uddg=" in url:
+                    url_match = _UDDG_RE.search(url)
+                    if url_match:
+                        url = unquote(url_match.group(1))
+
+                snippet = _text(snippet_elem) if snippet_elem else ""
+
+                results.append(SearchResult(
+                    title=title,
+                    url=url,
+                    snippet=snippet,
+                    engine=self.name,
+                    relevance=relevances[i]
+                ))
+
+            if progress_callback and (i + 1) % 5 == 0:
+                progress_callback(self.name, "progress",
+                                 f"Processed {i + 1}/{len(result_divs)} results")
 
-        if progress_callback:
-            progress_callback(self.name, "starting", "Initiating Yahoo search...")
-
-        try:
-            response = self._make_request(self.base_url, params={"p": query})
-            if not response:
-                return results
+        return results
 
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing results...")
 
-            soup = BeautifulSoup(response.text, "lxml")
-            result_items = soup.select("div.algo-sr") or soup.select("div.dd.algo")
+class BingSearch(BaseSearchEngine):
+    """Bing search engine."""
 
-            for i, item in enumerate(result_items[:max_results]):
-                title_elem = item.select_one("h3 a") or item.select_one("a.ac-algo")
-                snippet_elem = item.select_one("p") or item.select_one(".compText")
+    RESULT_XPATH = _xpath(f"(//li[{_xp_class('b_algo')}])[position() <= $limit]")
+    # (has title link, title, url, snippet) of each result
+    FIELD_XPATHS = (
+        _xpath("boolean((.//h2//a)[1])"),
+        _xpath("normalize-space((.//h2//a)[1])"),
+        _xpath("string((.//h2//a)[1]/@href)"),
+        _xpath(f"normalize-space((.//*[{_xp_class('b_caption')}]//p)[1])"),
+    )
+    PAGE_PARAM = "first"
+    RAISE_ERRORS = True
 
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    url = title_elem.get("href", "")
-                    snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
+    def __init__(self):
+        super().__init__("Bing", "https://www.bing.com/search")
 
-                    results.append(SearchResult(
-                        title=title,
-                        url=url,
-                        snippet=snippet,
-                        engine=self.name,
-                        relevance=1.0 - (i / max_results)
-                    ))
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {"q": query}
 
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} results")
 
-        except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
+class BraveSearch(BaseSearchEngine):
+    """Brave Search engine."""
 
-        return results
+    SELECTORS = Selectors(result=(".snippet",), title=(".snippet-title",),
+                          snippet=(".snippet-description",), url=(".snippet-url",))
+    RESULT_STRAINER = _class_strainer(None, "snippet")
+    PAGE_PARAM = "offset"
+    PAGE_SIZE = 20
+    RAISE_ERRORS = True
 
+    def __init__(self):
+        super().__init__("Brave", "https://search.brave.com/search")
 
-class YandexSearch(BaseSearchEngine):
-    """Yandex search engine (Russian)."""
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {"q": query}
 
-    def __init__(self):
-        super().__init__("Yandex", "https://yandex.com/search/")
+    def _page_offset(self, page: int) -> int:
+        # Brave counts pages, not results
+        return page
 
-    def search(self, query: str, max_results: int = 20,
+    def _parse(self, body: str, max_results: int,
                progress_callback: Optional[Callable] = None) -> List[SearchResult]:
         results = []
+        relevances = _relevances(max_results)
+        sels = self.SELECTORS
+        result_items = _select_nodes(body, *sels.result, strainer=self.RESULT_STRAINER,
+                                     limit=max_results)
+
+        for i, item in enumerate(result_items):
+            title_elem = _first_of(item, sels.title)
+            # Brave shows the URL as text rather than linking it
+            url_elem = _first_of(item, sels.url)
+            snippet_elem = _first_of(item, sels.snippet)
+
+            if title_elem:
+                title = _text(title_elem)
+                url = _text(url_elem) if url_elem else ""
+                if not url.startswith("http"):
+                    url = "https://" + url
+                snippet = _text(snippet_elem) if snippet_elem else ""
+
+                results.append(SearchResult(
+                    title=title,
+                    url=url,
+                    snippet=snippet,
+                    engine=self.name,
+                    relevance=relevances[i]
+                ))
 
-        if progress_callback:
-            progress_callback(self.name, "starting", "Initiating Yandex search...")
+        return results
 
-        try:
-            response = self._make_request(self.base_url, params={"text": query})
-            if not response:
-                return results
 
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing results...")
+# ============= DARKNET SEARCH ENGINES =============
 
-            soup = BeautifulSoup(response.text, "lxml")
-            result_items = soup.select("li.serp-item")
+class AhmiaSearch(BaseSearchEngine):
+    """Ahmia.fi - Clearnet gateway to search Tor hidden services."""
 
-            for i, item in enumerate(result_items[:max_results]):
-                title_elem = item.select_one("h2 a") or item.select_one("a.organic__url")
-                snippet_elem = item.select_one(".organic__content-wrapper") or item.select_one(".text-container")
+    SELECTORS = Selectors(result=("li.result",), title=("h4 a",), snippet=("p",),
+                          url=(".onion a",))
+    RESULT_STRAINER = _class_strainer("li", "result")
+    FAST_BLOCK_RE = re.compile(r'<(li)\s[^>]*' + _class_re("result"))
+    FAST_TITLE_RE = re.compile(r'<h4\b[^>]*>(?:(?!</h4>).)*?<a\s[^>]*?href="([^"]*)"[^>]*>(.*?)</a>', re.S)
+    FAST_SNIPPET_RE = re.compile(r'<p\b[^>]*>(.*?)</p>', re.S)
+    FAST_URL_RE = re.compile(_class_re("onion") + r'.*?<a\s[^>]*?href="([^"]*)"', re.S)
+    ENGINE_LABEL = "{name} (Darknet)"
+    START_MESSAGE = "Searching darknet index..."
+    PARSE_MESSAGE = "Parsing darknet results..."
+    COMPLETE_MESSAGE = "Found {count} darknet results"
+    RAISE_ERRORS = True
 
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    url = title_elem.get("href", "")
-                    snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
+    def __init__(self):
+        super().__init__("Ahmia", "https://ahmia.fi/search/")
 
-                    results.append(SearchResult(
-                        title=title,
-                        url=url,
-                        snippet=snippet,
-                        engine=self.name,
-                        relevance=1.0 - (i / max_results)
-                    ))
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {"q": query}
 
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} results")
 
-        except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
+class TorchSearch(BaseSearchEngine):
+    """Torch - Tor network search engine (requires Tor)."""
 
-        return results
+    SELECTORS = Selectors(result=(".result",), title=("a",), snippet=("p",))
+    RESULT_STRAINER = _class_strainer(None, "result")
+    FAST_BLOCK_RE = re.compile(r'<(\w+)\s[^>]*' + _class_re("result"))
+    FAST_TITLE_RE = re.compile(r'<a\s[^>]*?href="([^"]*)"[^>]*>(.*?)</a>', re.S)
+    FAST_SNIPPET_RE = re.compile(r'<p\b[^>]*>(.*?)</p>', re.S)
+    ENGINE_LABEL = "{name} (Tor)"
+    START_MESSAGE = "Connecting via Tor..."
+    PARSE_MESSAGE = "Parsing Torch results..."
+    COMPLETE_MESSAGE = "Found {count} onion results"
+    RAISE_ERRORS = True
+    requires_tor = True
 
+    def __init__(self):
+        super().__init__("Torch", "http://torchdeedp3i2jigzjdmfpn5ttjhthh5wbmda2rber7cqskosuh7vqid.onion/search")
 
-class QwantSearch(BaseSearchEngine):
-    """Qwant search engine (European, privacy-focused)."""
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {"query": query, "action": "search"}
 
-    def __init__(self):
-        super().__init__("Qwant", "https://www.qwant.com/")
 
-    def search(self, query: str, max_results: int = 20,
-               progress_callback: Optional[Callable] = None) -> List[SearchResult]:
-        results = []
+class HaystackSearch(BaseSearchEngine):
+    """Haystack - Another Tor search engine."""
 
-        if progress_callback:
-            progress_callback(self.name, "starting", "Initiating Qwant search...")
+    SELECTORS = Selectors(result=(".result",), title=("a",), snippet=("p, .description",))
+    RESULT_STRAINER = _class_strainer(None, "result")
+    FAST_BLOCK_RE = re.compile(r'<(\w+)\s[^>]*' + _class_re("result"))
+    FAST_TITLE_RE = re.compile(r'<a\s[^>]*?href="([^"]*)"[^>]*>(.*?)</a>', re.S)
+    FAST_SNIPPET_RE = re.compile(
+        r'<p\b[^>]*>(.*?)</p>|<(\w+)\s[^>]*' + _class_re("description") + r'[^>]*>(.*?)</\2>', re.S)
+    ENGINE_LABEL = "{name} (Tor)"
+    START_MESSAGE = "Connecting via Tor to Haystack..."
+    PARSE_MESSAGE = "Parsing Haystack results..."
+    RAISE_ERRORS = True
+    requires_tor = True
 
-        try:
-            # Qwant uses API
-            api_url = "https://api.qwant.com/v3/search/web"
-            params = {"q": query, "count": max_results, "locale": "en_US", "offset": 0}
-            self.session.headers["Origin"] = "https://www.qwant.com"
+    def __init__(self):
+        super().__init__("Haystack", "http://haystak5njsmn2hqkewecpaxetahtwhsbsa64jom2k22z5afxhnpxfid.onion/")
 
-            response = self._make_request(api_url, params=params)
-            if not response:
-                return results
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {"q": query}
 
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing results...")
 
-            try:
-                data = response.json()
-                items = data.get("data", {}).get("result", {}).get("items", {}).get("mainline", [])
-
-                for group in items:
-                    if group.get("type") == "web":
-                        for i, item in enumerate(group.get("items", [])[:max_results]):
-                            results.append(SearchResult(
-                                title=item.get("title", ""),
-                                url=item.get("url", ""),
-                                snippet=item.get("desc", ""),
-                                engine=self.name,
-                                relevance=1.0 - (i / max_results)
-                            ))
-            except:
-                pass
+# ============= ADDITIONAL CLEARNET ENGINES =============
 
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} results")
+class YahooSearch(BaseSearchEngine):
+    """Yahoo search engine."""
 
-        except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
+    SELECTORS = Selectors(result=("div.algo-sr", "div.dd.algo"), title=("h3 a", "a.ac-algo"),
+                          snippet=("p", ".compText"))
+    RESULT_STRAINER = _class_strainer("div", "algo-sr", "algo")
+    PAGE_PARAM = "b"
+    START_MESSAGE = "Initiating Yahoo search..."
 
-        return results
+    def __init__(self):
+        super().__init__("Yahoo", "https://search.yahoo.com/search")
 
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {"p": query}
 
-class MojeekSearch(BaseSearchEngine):
-    """Mojeek search engine (UK, independent index)."""
 
-    def __init__(self):
-        super().__init__("Mojeek", "https://www.mojeek.com/search")
+class YandexSearch(BaseSearchEngine):
+    """Yandex search engine (Russian)."""
 
-    def search(self, query: str, max_results: int = 20,
-               progress_callback: Optional[Callable] = None) -> List[SearchResult]:
-        results = []
+    SELECTORS = Selectors(result=("li.serp-item",), title=("h2 a", "a.organic__url"),
+                          snippet=(".organic__content-wrapper", ".text-container"))
+    RESULT_STRAINER = _class_strainer("li", "serp-item")
+    START_MESSAGE = "Initiating Yandex search..."
 
-        if progress_callback:
-            progress_callback(self.name, "starting", "Initiating Mojeek search...")
+    def __init__(self):
+        super().__init__("Yandex", "https://yandex.com/search/")
 
-        try:
-            response = self._make_request(self.base_url, params={"q": query})
-            if not response:
-                return results
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {"text": query}
 
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing results...")
 
-            soup = BeautifulSoup(response.text, "lxml")
-            result_items = soup.select("ul.results-standard li")
+if MSGSPEC_AVAILABLE:
+    class _QwantItem(msgspec.Struct):
+        title: Optional[str] = ""
+        url: Optional[str] = ""
+        desc: Optional[str] = ""
 
-            for i, item in enumerate(result_items[:max_results]):
-                title_elem = item.select_one("a.title")
-                snippet_elem = item.select_one("p.s")
-                url_elem = item.select_one("a.title")
+    class _QwantGroup(msgspec.Struct):
+        type: Optional[str] = None
+        items: List[_QwantItem] = []
 
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    url = url_elem.get("href", "") if url_elem else ""
-                    snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
+    class _QwantItems(msgspec.Struct):
+        mainline: List[_QwantGroup] = []
 
-                    results.append(SearchResult(
-                        title=title,
-                        url=url,
-                        snippet=snippet,
-                        engine=self.name,
-                        relevance=1.0 - (i / max_results)
-                    ))
+    class _QwantResult(msgspec.Struct):
+        items: _QwantItems = msgspec.field(default_factory=_QwantItems)
 
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} results")
+    class _QwantData(msgspec.Struct):
+        result: _QwantResult = msgspec.field(default_factory=_QwantResult)
 
-        except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
+    class _QwantReply(msgspec.Struct):
+        data: _QwantData = msgspec.field(default_factory=_QwantData)
+
+    _QWANT_DECODER = msgspec.json.Decoder(_QwantReply)
 
-        return results
 
+class QwantSearch(BaseSearchEngine):
+    """Qwant search engine (European, privacy-focused)."""
 
-class EcosiaSearch(BaseSearchEngine):
-    """Ecosia search engine (Bing-based, plants trees)."""
+    START_MESSAGE = "Initiating Qwant search..."
+    HEADERS = {"Origin": "https://www.qwant.com"}
+    RAW_BODY = True
 
     def __init__(self):
-        super().__init__("Ecosia", "https://www.ecosia.org/search")
+        super().__init__("Qwant", "https://www.qwant.com/")
 
-    def search(self, query: str, max_results: int = 20,
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        # Qwant uses API
+        api_url = "https://api.qwant.com/v3/search/web"
+        return api_url, {"q": query, "count": max_results, "locale": "en_US", "offset": 0}
+
+    def _web_groups(self, body: bytes) -> List[List[Tuple[str, str, str]]]:
+        """(title, url, desc) of the items of each web result group."""
+        if MSGSPEC_AVAILABLE:
+            try:
+                return [
+                    [(item.title, item.url, item.desc) for item in group.items]
+                    for group in _QWANT_DECODER.decode(body).data.result.items.mainline
+                    if group.type == "web"
+                ]
+            except msgspec.DecodeError:
+                pass  # Unexpected shape: decode generically below
+        data = _json_object(body)
+        items = (((data.get("data") or {}).get("result") or {}).get("items") or {}).get("mainline") or []
+        return [
+            [(item.get("title", ""), item.get("url", ""), item.get("desc", ""))
+             for item in (group.get("items") or [])]
+            for group in items
+            if group.get("type") == "web"
+        ]
+
+    def _parse(self, body: bytes, max_results: int,
                progress_callback: Optional[Callable] = None) -> List[SearchResult]:
         results = []
+        relevances = _relevances(max_results)
+
+        for group in self._web_groups(body):
+            for i, (title, url, desc) in enumerate(itertools.islice(group, max_results)):
+                results.append(SearchResult(
+                    title=title or "",
+                    url=url or "",
+                    snippet=desc or "",
+                    engine=self.name,
+                    relevance=relevances[i]
+                ))
 
-        if progress_callback:
-            progress_callback(self.name, "starting", "Initiating Ecosia search...")
+        return results
 
-        try:
-            response = self._make_request(self.base_url, params={"q": query, "method": "index"})
-            if not response:
-                return results
 
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing results...")
+class MojeekSearch(BaseSearchEngine):
+    """Mojeek search engine (UK, independent index)."""
 
-            soup = BeautifulSoup(response.text, "lxml")
-            result_items = soup.select("div.result")
+    RESULT_XPATH = _xpath(f"(//ul[{_xp_class('results-standard')}]//li)[position() <= $limit]")
+    # (has title link, title, url, snippet) of each result
+    FIELD_XPATHS = (
+        _xpath(f"boolean((.//a[{_xp_class('title')}])[1])"),
+        _xpath(f"normalize-space((.//a[{_xp_class('title')}])[1])"),
+        _xpath(f"string((.//a[{_xp_class('title')}])[1]/@href)"),
+        _xpath(f"normalize-space((.//p[{_xp_class('s')}])[1])"),
+    )
+    PAGE_PARAM = "s"
+    START_MESSAGE = "Initiating Mojeek search..."
 
-            for i, item in enumerate(result_items[:max_results]):
-                title_elem = item.select_one("a.result-title") or item.select_one("h2 a")
-                snippet_elem = item.select_one("p.result-snippet") or item.select_one(".result-body")
+    def __init__(self):
+        super().__init__("Mojeek", "https://www.mojeek.com/search")
 
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    url = title_elem.get("href", "")
-                    snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {"q": query}
 
-                    results.append(SearchResult(
-                        title=title,
-                        url=url,
-                        snippet=snippet,
-                        engine=self.name,
-                        relevance=1.0 - (i / max_results)
-                    ))
 
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} results")
+class EcosiaSearch(BaseSearchEngine):
+    """Ecosia search engine (Bing-based, plants trees)."""
 
-        except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
+    SELECTORS = Selectors(result=("div.result",), title=("a.result-title", "h2 a"),
+                          snippet=("p.result-snippet", ".result-body"))
+    RESULT_STRAINER = _class_strainer("div", "result")
+    START_MESSAGE = "Initiating Ecosia search..."
 
-        return results
+    def __init__(self):
+        super().__init__("Ecosia", "https://www.ecosia.org/search")
+
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {"q": query, "method": "index"}
 
 
 # ============= DEEP SEARCH ENGINES (Specialized) =============
@@ -703,166 +1213,156 @@ class EcosiaSearch(BaseSearchEngine):
 class GoogleScholarSearch(BaseSearchEngine):
     """Google Scholar for academic papers."""
 
+    RESULT_XPATH = _xpath(f"(//div[{_xp_class('gs_r')}][{_xp_class('gs_or')}][{_xp_class('gs_scl')}])[position() <= $limit]")
+    # (has title link, title, url, snippet) of each result
+    FIELD_XPATHS = (
+        _xpath(f"boolean((.//h3[{_xp_class('gs_rt')}]//a)[1])"),
+        _xpath(f"normalize-space((.//h3[{_xp_class('gs_rt')}]//a)[1])"),
+        _xpath(f"string((.//h3[{_xp_class('gs_rt')}]//a)[1]/@href)"),
+        _xpath(f"normalize-space((.//div[{_xp_class('gs_rs')}])[1])"),
+    )
+    TITLE_PREFIX = "[Scholar] "
+    START_MESSAGE = "Searching academic papers..."
+    PARSE_MESSAGE = "Parsing academic results..."
+    COMPLETE_MESSAGE = "Found {count} academic papers"
+
     def __init__(self):
         super().__init__("GoogleScholar", "https://scholar.google.com/scholar")
 
-    def search(self, query: str, max_results: int = 20,
-               progress_callback: Optional[Callable] = None) -> List[SearchResult]:
-        results = []
-
-        if progress_callback:
-            progress_callback(self.name, "starting", "Searching academic papers...")
-
-        try:
-            response = self._make_request(self.base_url, params={"q": query, "hl": "en"})
-            if not response:
-                return results
-
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing academic results...")
-
-            soup = BeautifulSoup(response.text, "lxml")
-            result_items = soup.select("div.gs_r.gs_or.gs_scl")
-
-            for i, item in enumerate(result_items[:max_results]):
-                title_elem = item.select_one("h3.gs_rt a")
-                snippet_elem = item.select_one("div.gs_rs")
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {"q": query, "hl": "en"}
 
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    url = title_elem.get("href", "")
-                    snippet = snippet_elem.get_text(strip=True) if snippet_elem else ""
 
-                    results.append(SearchResult(
-                        title=f"[Scholar] {title}",
-                        url=url,
-                        snippet=snippet,
-                        engine=self.name,
-                        relevance=1.0 - (i / max_results)
-                    ))
+if MSGSPEC_AVAILABLE:
+    class _ArchiveDoc(msgspec.Struct):
+        identifier: str = ""
+        title: Optional[str] = None
+        description: Union[str, List[str], None] = ""
 
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} academic papers")
+    class _ArchiveResponse(msgspec.Struct):
+        docs: List[_ArchiveDoc] = []
 
-        except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
+    class _ArchiveReply(msgspec.Struct):
+        response: _ArchiveResponse = msgspec.field(default_factory=_ArchiveResponse)
 
-        return results
+    _ARCHIVE_DECODER = msgspec.json.Decoder(_ArchiveReply)
 
 
 class ArchiveOrgSearch(BaseSearchEngine):
     """Internet Archive (Wayback Machine) search."""
 
+    START_MESSAGE = "Searching Internet Archive..."
+    PARSE_MESSAGE = "Parsing archive results..."
+    COMPLETE_MESSAGE = "Found {count} archived items"
+    RAW_BODY = True
+
     def __init__(self):
         super().__init__("Archive.org", "https://archive.org/advancedsearch.php")
 
-    def search(self, query: str, max_results: int = 20,
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {
+            "q": query,
+            "fl[]": ["identifier", "title", "description"],
+            "rows": max_results,
+            "output": "json"
+        }
+
+    def _docs(self, body: bytes) -> List[Tuple[str, Any, Any]]:
+        """(identifier, title, description) of each returned item."""
+        if MSGSPEC_AVAILABLE:
+            try:
+                return [(doc.identifier, doc.title, doc.description)
+                        for doc in _ARCHIVE_DECODER.decode(body).response.docs]
+            except msgspec.DecodeError:
+                pass  # Unexpected shape: decode generically below
+        data = _json_object(body)
+        return [(doc.get("identifier", ""), doc.get("title"), doc.get("description", ""))
+                for doc in (data.get("response") or {}).get("docs") or []]
+
+    def _parse(self, body: bytes, max_results: int,
                progress_callback: Optional[Callable] = None) -> List[SearchResult]:
         results = []
+        relevances = _relevances(max_results)
+
+        for i, (identifier, title, description) in enumerate(
+                itertools.islice(self._docs(body), max_results)):
+            title = title or identifier
+            if isinstance(description, list):
+                description = " ".join(description)
+
+            results.append(SearchResult(
+                title=f"[Archive] {title}",
+                url=f"https://archive.org/details/{identifier}",
+                snippet=description[:300] if description else "",
+                engine=self.name,
+                relevance=relevances[i]
+            ))
 
-        if progress_callback:
-            progress_callback(self.name, "starting", "Searching Internet Archive...")
-
-        try:
-            params = {
-                "q": query,
-                "fl[]": ["identifier", "title", "description"],
-                "rows": max_results,
-                "output": "json"
-            }
-            response = self._make_request(self.base_url, params=params)
-            if not response:
-                return results
+        return results
 
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing archive results...")
 
-            try:
-                data = response.json()
-                docs = data.get("response", {}).get("docs", [])
-
-                for i, doc in enumerate(docs[:max_results]):
-                    identifier = doc.get("identifier", "")
-                    title = doc.get("title", identifier)
-                    description = doc.get("description", "")
-                    if isinstance(description, list):
-                        description = " ".join(description)
-
-                    results.append(SearchResult(
-                        title=f"[Archive] {title}",
-                        url=f"https://archive.org/details/{identifier}",
-                        snippet=description[:300] if description else "",
-                        engine=self.name,
-                        relevance=1.0 - (i / max_results)
-                    ))
-            except:
-                pass
+if MSGSPEC_AVAILABLE:
+    class _WikiHit(msgspec.Struct):
+        title: str = ""
+        snippet: str = ""
 
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} archived items")
+    class _WikiQuery(msgspec.Struct):
+        search: List[_WikiHit] = []
 
-        except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
+    class _WikiReply(msgspec.Struct):
+        query: _WikiQuery = msgspec.field(default_factory=_WikiQuery)
 
-        return results
+    _WIKI_DECODER = msgspec.json.Decoder(_WikiReply)
 
 
 class WikipediaSearch(BaseSearchEngine):
     """Wikipedia search."""
 
+    START_MESSAGE = "Searching Wikipedia..."
+    PARSE_MESSAGE = "Parsing Wikipedia results..."
+    COMPLETE_MESSAGE = "Found {count} Wikipedia articles"
+    RAW_BODY = True
+
     def __init__(self):
         super().__init__("Wikipedia", "https://en.wikipedia.org/w/api.php")
 
-    def search(self, query: str, max_results: int = 20,
-               progress_callback: Optional[Callable] = None) -> List[SearchResult]:
-        results = []
-
-        if progress_callback:
-            progress_callback(self.name, "starting", "Searching Wikipedia...")
-
-        try:
-            params = {
-                "action": "query",
-                "list": "search",
-                "srsearch": query,
-                "srlimit": max_results,
-                "format": "json"
-            }
-            response = self._make_request(self.base_url, params=params)
-            if not response:
-                return results
-
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing Wikipedia results...")
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {
+            "action": "query",
+            "list": "search",
+            "srsearch": query,
+            "srlimit": max_results,
+            "format": "json"
+        }
 
+    def _hits(self, body: bytes) -> List[Tuple[str, str]]:
+        """(title, snippet) of each search hit."""
+        if MSGSPEC_AVAILABLE:
             try:
-                data = response.json()
-                items = data.get("query", {}).get("search", [])
-
-                for i, item in enumerate(items):
-                    title = item.get("title", "")
-                    snippet = item.get("snippet", "")
-                    # Clean HTML from snippet
-                    snippet = re.sub(r'<[^>]+>', '', snippet)
-
-                    results.append(SearchResult(
-                        title=f"[Wikipedia] {title}",
-                        url=f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}",
-                        snippet=snippet,
-                        engine=self.name,
-                        relevance=1.0 - (i / max_results)
-                    ))
-            except:
-                pass
+                return [(hit.title, hit.snippet)
+                        for hit in _WIKI_DECODER.decode(body).query.search]
+            except msgspec.DecodeError:
+                pass  # Unexpected shape: decode generically below
+        data = _json_object(body)
+        return [(hit.get("title", ""), hit.get("snippet", ""))
+                for hit in (data.get("query") or {}).get("search") or []]
+
+    def _parse(self, body: bytes, max_results: int,
+               progress_callback: Optional[Callable] = None) -> List[SearchResult]:
+        results = []
+        relevances = _relevances(max_results)
 
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} Wikipedia articles")
+        for i, (title, snippet) in enumerate(itertools.islice(self._hits(body), max_results)):
+            # Clean HTML (search match highlighting) from snippet
+            snippet = _strip_tags(snippet)
 
-        except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
+            results.append(SearchResult(
+                title=f"[Wikipedia] {title}",
+                url=f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}",
+                snippet=snippet,
+                engine=self.name,
+                relevance=relevances[i]
+            ))
 
         return results
 
@@ -870,54 +1370,39 @@ class WikipediaSearch(BaseSearchEngine):
 class RedditSearch(BaseSearchEngine):
     """Reddit search."""
 
+    START_MESSAGE = "Searching Reddit..."
+    PARSE_MESSAGE = "Parsing Reddit posts..."
+    COMPLETE_MESSAGE = "Found {count} Reddit posts"
+    HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; WebSearchPro/1.0)"}
+    RAW_BODY = True
+
     def __init__(self):
         super().__init__("Reddit", "https://www.reddit.com/search.json")
 
-    def search(self, query: str, max_results: int = 20,
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {"q": query, "limit": max_results, "sort": "relevance"}
+
+    def _parse(self, body: bytes, max_results: int,
                progress_callback: Optional[Callable] = None) -> List[SearchResult]:
         results = []
-
-        if progress_callback:
-            progress_callback(self.name, "starting", "Searching Reddit...")
-
-        try:
-            params = {"q": query, "limit": max_results, "sort": "relevance"}
-            self.session.headers["User-Agent"] = "Mozilla/5.0 (compatible; WebSearchPro/1.0)"
-
-            response = self._make_request(self.base_url, params=params)
-            if not response:
-                return results
-
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing Reddit posts...")
-
-            try:
-                data = response.json()
-                posts = data.get("data", {}).get("children", [])
-
-                for i, post in enumerate(posts[:max_results]):
-                    post_data = post.get("data", {})
-                    title = post_data.get("title", "")
-                    subreddit = post_data.get("subreddit", "")
-                    selftext = post_data.get("selftext", "")[:200]
-                    permalink = post_data.get("permalink", "")
-
-                    results.append(SearchResult(
-                        title=f"[r/{subreddit}] {title}",
-                        url=f"https://www.reddit.com{permalink}",
-                        snippet=selftext if selftext else f"Posted in r/{subreddit}",
-                        engine=self.name,
-                        relevance=1.0 - (i / max_results)
-                    ))
-            except:
-                pass
-
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} Reddit posts")
-
-        except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
+        relevances = _relevances(max_results)
+        data = _json_object(body)
+        posts = (data.get("data") or {}).get("children") or []
+
+        for i, post in enumerate(itertools.islice(posts, max_results)):
+            post_data = post.get("data") or {}
+            title = post_data.get("title", "")
+            subreddit = post_data.get("subreddit", "")
+            selftext = (post_data.get("selftext") or "")[:200]
+            permalink = post_data.get("permalink", "")
+
+            results.append(SearchResult(
+                title=f"[r/{subreddit}] {title}",
+                url=f"https://www.reddit.com{permalink}",
+                snippet=selftext if selftext else f"Posted in r/{subreddit}",
+                engine=self.name,
+                relevance=relevances[i]
+            ))
 
         return results
 
@@ -925,53 +1410,38 @@ class RedditSearch(BaseSearchEngine):
 class GitHubSearch(BaseSearchEngine):
     """GitHub repository search."""
 
+    START_MESSAGE = "Searching GitHub repositories..."
+    PARSE_MESSAGE = "Parsing GitHub repos..."
+    COMPLETE_MESSAGE = "Found {count} GitHub repos"
+    HEADERS = {"Accept": "application/vnd.github.v3+json"}
+    RAW_BODY = True
+
     def __init__(self):
         super().__init__("GitHub", "https://api.github.com/search/repositories")
 
-    def search(self, query: str, max_results: int = 20,
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {"q": query, "per_page": max_results, "sort": "stars"}
+
+    def _parse(self, body: bytes, max_results: int,
                progress_callback: Optional[Callable] = None) -> List[SearchResult]:
         results = []
-
-        if progress_callback:
-            progress_callback(self.name, "starting", "Searching GitHub repositories...")
-
-        try:
-            params = {"q": query, "per_page": max_results, "sort": "stars"}
-            self.session.headers["Accept"] = "application/vnd.github.v3+json"
-
-            response = self._make_request(self.base_url, params=params)
-            if not response:
-                return results
-
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing GitHub repos...")
-
-            try:
-                data = response.json()
-                repos = data.get("items", [])
-
-                for i, repo in enumerate(repos[:max_results]):
-                    name = repo.get("full_name", "")
-                    description = repo.get("description", "") or ""
-                    stars = repo.get("stargazers_count", 0)
-                    url = repo.get("html_url", "")
-
-                    results.append(SearchResult(
-                        title=f"[GitHub] {name} ⭐{stars}",
-                        url=url,
-                        snippet=description[:200],
-                        engine=self.name,
-                        relevance=1.0 - (i / max_results)
-                    ))
-            except:
-                pass
-
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} GitHub repos")
-
-        except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
+        relevances = _relevances(max_results)
+        data = _json_object(body)
+        repos = data.get("items") or []
+
+        for i, repo in enumerate(itertools.islice(repos, max_results)):
+            name = repo.get("full_name", "")
+            description = repo.get("description", "") or ""
+            stars = repo.get("stargazers_count", 0)
+            url = repo.get("html_url", "")
+
+            results.append(SearchResult(
+                title=f"[GitHub] {name} ⭐{stars}",
+                url=url,
+                snippet=description[:200],
+                engine=self.name,
+                relevance=relevances[i]
+            ))
 
         return results
 
@@ -979,246 +1449,319 @@ class GitHubSearch(BaseSearchEngine):
 class StackOverflowSearch(BaseSearchEngine):
     """StackOverflow search."""
 
+    START_MESSAGE = "Searching StackOverflow..."
+    PARSE_MESSAGE = "Parsing StackOverflow questions..."
+    COMPLETE_MESSAGE = "Found {count} StackOverflow questions"
+    RAW_BODY = True
+
     def __init__(self):
         super().__init__("StackOverflow", "https://api.stackexchange.com/2.3/search/advanced")
 
-    def search(self, query: str, max_results: int = 20,
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {
+            "q": query,
+            "pagesize": max_results,
+            "order": "desc",
+            "sort": "relevance",
+            "site": "stackoverflow"
+        }
+
+    def _parse(self, body: bytes, max_results: int,
                progress_callback: Optional[Callable] = None) -> List[SearchResult]:
         results = []
+        relevances = _relevances(max_results)
+        data = _json_object(body)
+        items = data.get("items") or []
+
+        for i, item in enumerate(itertools.islice(items, max_results)):
+            title = item.get("title", "")
+            link = item.get("link", "")
+            score = item.get("score", 0)
+            answered = "✓" if item.get("is_answered") else ""
+
+            results.append(SearchResult(
+                title=f"[SO {answered}] {title} ({score} votes)",
+                url=link,
+                snippet=f"Tags: {', '.join((item.get('tags') or [])[:5])}",
+                engine=self.name,
+                relevance=relevances[i]
+            ))
 
-        if progress_callback:
-            progress_callback(self.name, "starting", "Searching StackOverflow...")
+        return results
 
-        try:
-            params = {
-                "q": query,
-                "pagesize": max_results,
-                "order": "desc",
-                "sort": "relevance",
-                "site": "stackoverflow"
-            }
-            response = self._make_request(self.base_url, params=params)
-            if not response:
-                return results
 
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing StackOverflow questions...")
+class HackerNewsSearch(BaseSearchEngine):
+    """Hacker News search via Algolia API."""
 
-            try:
-                data = response.json()
-                items = data.get("items", [])
-
-                for i, item in enumerate(items[:max_results]):
-                    title = item.get("title", "")
-                    link = item.get("link", "")
-                    score = item.get("score", 0)
-                    answered = "✓" if item.get("is_answered") else ""
-
-                    results.append(SearchResult(
-                        title=f"[SO {answered}] {title} ({score} votes)",
-                        url=link,
-                        snippet=f"Tags: {', '.join(item.get('tags', [])[:5])}",
-                        engine=self.name,
-                        relevance=1.0 - (i / max_results)
-                    ))
-            except:
-                pass
+    START_MESSAGE = "Searching Hacker News..."
+    PARSE_MESSAGE = "Parsing HN posts..."
+    COMPLETE_MESSAGE = "Found {count} HN posts"
+    RAW_BODY = True
 
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} StackOverflow questions")
+    def __init__(self):
+        super().__init__("HackerNews", "https://hn.algolia.com/api/v1/search")
 
-        except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {"query": query, "hitsPerPage": max_results}
+
+    def _parse(self, body: bytes, max_results: int,
+               progress_callback: Optional[Callable] = None) -> List[SearchResult]:
+        results = []
+        relevances = _relevances(max_results)
+        data = _json_object(body)
+        hits = data.get("hits") or []
+
+        for i, hit in enumerate(itertools.islice(hits, max_results)):
+            title = hit.get("title", "") or hit.get("story_title", "")
+            url = hit.get("url", "") or f"https://news.ycombinator.com/item?id={hit.get('objectID', '')}"
+            points = hit.get("points", 0)
+            num_comments = hit.get("num_comments", 0)
+
+            if title:
+                results.append(SearchResult(
+                    title=f"[HN] {title} ({points}↑ {num_comments}💬)",
+                    url=url,
+                    snippet="Posted on Hacker News",
+                    engine=self.name,
+                    relevance=relevances[i]
+                ))
 
         return results
 
 
-class HackerNewsSearch(BaseSearchEngine):
-    """Hacker News search via Algolia API."""
+class SemanticScholarSearch(BaseSearchEngine):
+    """Semantic Scholar academic search."""
+
+    START_MESSAGE = "Searching Semantic Scholar..."
+    PARSE_MESSAGE = "Parsing academic papers..."
+    COMPLETE_MESSAGE = "Found {count} papers"
+    RAW_BODY = True
 
     def __init__(self):
-        super().__init__("HackerNews", "https://hn.algolia.com/api/v1/search")
+        super().__init__("SemanticScholar", "https://api.semanticscholar.org/graph/v1/paper/search")
 
-    def search(self, query: str, max_results: int = 20,
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {
+            "query": query,
+            "limit": max_results,
+            "fields": "title,abstract,url,citationCount,year"
+        }
+
+    def _parse(self, body: bytes, max_results: int,
                progress_callback: Optional[Callable] = None) -> List[SearchResult]:
         results = []
+        relevances = _relevances(max_results)
+        data = _json_object(body)
+        papers = data.get("data") or []
+
+        for i, paper in enumerate(itertools.islice(papers, max_results)):
+            title = paper.get("title", "")
+            abstract = paper.get("abstract", "") or ""
+            url = paper.get("url", "")
+            citations = paper.get("citationCount", 0)
+            year = paper.get("year", "")
+
+            results.append(SearchResult(
+                title=f"[Paper {year}] {title} ({citations} citations)",
+                url=url,
+                snippet=abstract[:250] if abstract else "No abstract available",
+                engine=self.name,
+                relevance=relevances[i]
+            ))
 
-        if progress_callback:
-            progress_callback(self.name, "starting", "Searching Hacker News...")
+        return results
 
-        try:
-            params = {"query": query, "hitsPerPage": max_results}
-            response = self._make_request(self.base_url, params=params)
-            if not response:
-                return results
 
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing HN posts...")
+class PubMedSearch(BaseSearchEngine):
+    """
+    PubMed medical/life sciences search.
 
-            try:
-                data = response.json()
-                hits = data.get("hits", [])
-
-                for i, hit in enumerate(hits[:max_results]):
-                    title = hit.get("title", "") or hit.get("story_title", "")
-                    url = hit.get("url", "") or f"https://news.ycombinator.com/item?id={hit.get('objectID', '')}"
-                    points = hit.get("points", 0)
-                    num_comments = hit.get("num_comments", 0)
-
-                    if title:
-                        results.append(SearchResult(
-                            title=f"[HN] {title} ({points}↑ {num_comments}💬)",
-                            url=url,
-                            snippet=f"Posted on Hacker News",
-                            engine=self.name,
-                            relevance=1.0 - (i / max_results)
-                        ))
-            except:
-                pass
+    Two requests per search (esearch for IDs, then esummary for details),
+    so search() and search_async() are overridden.
+    """
 
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} HN posts")
+    START_MESSAGE = "Searching PubMed medical database..."
+    COMPLETE_MESSAGE = "Found {count} medical papers"
+    SUMMARY_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
+    RAW_BODY = True
 
-        except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
+    def __init__(self):
+        super().__init__("PubMed", "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi")
 
-        return results
+    def _build_request(self, query: str, max_results: int) -> Tuple[str, Dict[str, Any]]:
+        return self.base_url, {
+            "db": "pubmed",
+            "term": query,
+            "retmax": max_results,
+            "retmode": "json",
+            # Keep the matches on NCBI's history server for esummary
+            "usehistory": "y"
+        }
+
+    def _summary_request(self, search_body: bytes,
+                         max_results: int) -> Tuple[int, str, Dict[str, Any]]:
+        """
+        Return (number of IDs found, url, params) of the esummary call for
+        an esearch response. esummary reads the matches back from the
+        history server (WebEnv/query_key) rather than being sent the IDs;
+        if esearch kept no history it falls back to the ID list.
+        """
+        result = _json_object(search_body).get("esearchresult") or {}
+        ids = result.get("idlist") or []
+        webenv = result.get("webenv")
+        query_key = result.get("querykey")
 
+        if webenv and query_key:
+            params = {
+                "db": "pubmed",
+                "WebEnv": webenv,
+                "query_key": query_key,
+                "retstart": 0,
+                "retmax": max_results,
+                "retmode": "json"
+            }
+        else:
+            params = {
+                "db": "pubmed",
+                "id": ",".join(ids),
+                "retmode": "json"
+            }
+        return len(ids), self.SUMMARY_URL, params
 
-class SemanticScholarSearch(BaseSearchEngine):
-    """Semantic Scholar academic search."""
+    def _parse(self, body: bytes, max_results: int,
+               progress_callback: Optional[Callable] = None) -> List[SearchResult]:
+        """Parse an esummary response (papers come in its 'uids' order)."""
+        results = []
+        relevances = _relevances(max_results)
+        result_data = _json_object(body).get("result") or {}
+
+        for i, pmid in enumerate(itertools.islice(result_data.get("uids") or [], max_results)):
+            paper = result_data.get(pmid) or {}
+            title = paper.get("title", "")
+            source = paper.get("source", "")
+            pubdate = paper.get("pubdate", "")
+
+            if title:
+                results.append(SearchResult(
+                    title=f"[PubMed] {title}",
+                    url=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+                    snippet=f"Published in {source}, {pubdate}",
+                    engine=self.name,
+                    relevance=relevances[i]
+                ))
 
-    def __init__(self):
-        super().__init__("SemanticScholar", "https://api.semanticscholar.org/graph/v1/paper/search")
+        return results
+
+    def _complete(self, results: List[SearchResult],
+                  progress_callback: Optional[Callable]) -> List[SearchResult]:
+        if progress_callback:
+            progress_callback(self.name, "complete",
+                              self.COMPLETE_MESSAGE.format(count=len(results)))
+        return results
 
+    @_ttl_cached
     def search(self, query: str, max_results: int = 20,
                progress_callback: Optional[Callable] = None) -> List[SearchResult]:
         results = []
 
         if progress_callback:
-            progress_callback(self.name, "starting", "Searching Semantic Scholar...")
+            progress_callback(self.name, "starting", self.START_MESSAGE)
 
         try:
-            params = {
-                "query": query,
-                "limit": max_results,
-                "fields": "title,abstract,url,citationCount,year"
-            }
-            response = self._make_request(self.base_url, params=params)
-            if not response:
-                return results
-
-            if progress_callback:
-                progress_callback(self.name, "parsing", "Parsing academic papers...")
+            # First get IDs
+            url, params = self._build_request(query, max_results)
+            response = self._make_request(url, params=params)
 
             try:
-                data = response.json()
-                papers = data.get("data", [])
-
-                for i, paper in enumerate(papers[:max_results]):
-                    title = paper.get("title", "")
-                    abstract = paper.get("abstract", "") or ""
-                    url = paper.get("url", "")
-                    citations = paper.get("citationCount", 0)
-                    year = paper.get("year", "")
-
-                    results.append(SearchResult(
-                        title=f"[Paper {year}] {title} ({citations} citations)",
-                        url=url,
-                        snippet=abstract[:250] if abstract else "No abstract available",
-                        engine=self.name,
-                        relevance=1.0 - (i / max_results)
-                    ))
-            except:
-                pass
+                count, url, params = self._summary_request(response.content, max_results)
 
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} papers")
+                if count:
+                    if progress_callback:
+                        progress_callback(self.name, "parsing", f"Fetching {count} paper details...")
 
-        except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
+                    # Fetch summaries
+                    summary_response = self._make_request(url, params=params)
+                    results = self._parse(summary_response.content, max_results)
+            except SearchError:
+                # No summaries: report the search as complete with no papers
+                pass
 
-        return results
+            return self._complete(results, progress_callback)
 
+        except Exception as e:
+            return self._fail(e, progress_callback)
 
-class PubMedSearch(BaseSearchEngine):
-    """PubMed medical/life sciences search."""
+    @_ttl_cached
+    async def search_async(self, query: str, max_results: int = 20,
+                           progress_callback: Optional[Callable] = None,
+                           session: Optional['aiohttp.ClientSession'] = None) -> List[SearchResult]:
+        if not ASYNC_AVAILABLE:
+            return await BaseSearchEngine.search_async.__wrapped__(
+                self, query, max_results, progress_callback, session)
 
-    def __init__(self):
-        super().__init__("PubMed", "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi")
+        if session is None:
+            async with _new_client_session(self.requires_tor) as session:
+                return await PubMedSearch.search_async.__wrapped__(
+                    self, query, max_results, progress_callback, session)
 
-    def search(self, query: str, max_results: int = 20,
-               progress_callback: Optional[Callable] = None) -> List[SearchResult]:
         results = []
 
         if progress_callback:
-            progress_callback(self.name, "starting", "Searching PubMed medical database...")
+            progress_callback(self.name, "starting", self.START_MESSAGE)
 
         try:
-            # First get IDs
-            search_params = {
-                "db": "pubmed",
-                "term": query,
-                "retmax": max_results,
-                "retmode": "json"
-            }
-            response = self._make_request(self.base_url, params=search_params)
-            if not response:
-                return results
+            url, params = self._build_request(query, max_results)
+            body = await self._fetch(session, url, params=params, raw=True)
 
             try:
-                data = response.json()
-                ids = data.get("esearchresult", {}).get("idlist", [])
+                count, url, params = self._summary_request(body, max_results)
 
-                if ids:
+                if count:
                     if progress_callback:
-                        progress_callback(self.name, "parsing", f"Fetching {len(ids)} paper details...")
+                        progress_callback(self.name, "parsing", f"Fetching {count} paper details...")
 
-                    # Fetch summaries
-                    summary_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esummary.fcgi"
-                    summary_params = {
-                        "db": "pubmed",
-                        "id": ",".join(ids),
-                        "retmode": "json"
-                    }
-                    summary_response = self._make_request(summary_url, params=summary_params)
-
-                    if summary_response:
-                        summary_data = summary_response.json()
-                        result_data = summary_data.get("result", {})
-
-                        for i, pmid in enumerate(ids[:max_results]):
-                            paper = result_data.get(pmid, {})
-                            title = paper.get("title", "")
-                            source = paper.get("source", "")
-                            pubdate = paper.get("pubdate", "")
-
-                            if title:
-                                results.append(SearchResult(
-                                    title=f"[PubMed] {title}",
-                                    url=f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
-                                    snippet=f"Published in {source}, {pubdate}",
-                                    engine=self.name,
-                                    relevance=1.0 - (i / max_results)
-                                ))
-            except:
+                    summary_body = await self._fetch(session, url, params=params, raw=True)
+                    results = await self._parse_async(summary_body, max_results)
+            except SearchError:
+                # No summaries: report the search as complete with no papers
                 pass
 
-            if progress_callback:
-                progress_callback(self.name, "complete", f"Found {len(results)} medical papers")
+            return self._complete(results, progress_callback)
 
         except Exception as e:
-            if progress_callback:
-                progress_callback(self.name, "error", str(e))
-
-        return results
+            return self._fail(e, progress_callback)
 
 
 # ============= SEARCH ENGINE MANAGER =============
 
+# Tor probe result shared by every manager: (available, monotonic expiry).
+# A failed probe is only trusted briefly, so a freshly started Tor shows up
+TOR_CHECK_TTL = 300
+TOR_FAILURE_TTL = 5
+_tor_status: Tuple[bool, float] = (False, 0.0)
+_tor_status_lock = threading.Lock()
+# Set while a probe is running; later callers wait on it instead of probing
+_tor_probe: Optional[threading.Event] = None
+
+
+def _probe_tor() -> bool:
+    """Ask check.torproject.org, through the SOCKS proxy, whether Tor is in use."""
+    try:
+        proxies = {
+            "http": f"socks5h://{TOR_SOCKS_HOST}:{TOR_SOCKS_PORT}",
+            "https": f"socks5h://{TOR_SOCKS_HOST}:{TOR_SOCKS_PORT}"
+        }
+        response = requests.get(
+            "https://check.torproject.org/api/ip",
+            proxies=proxies,
+            timeout=5
+        )
+        data = response.json()
+        return bool(data.get("IsTor", False))
+    except (requests.RequestException, ValueError):
+        return False
+
+
 class SearchEngineManager:
     """Manages multiple search engines and coordinates searches."""
 
@@ -1259,54 +1802,85 @@ class SearchEngineManager:
             "haystack": HaystackSearch(),
         }
 
-        self._tor_available = None
-
-    def check_tor_connection(self) -> bool:
-        """Check if Tor is available and connected."""
-        if self._tor_available is not None:
-            return self._tor_available
+        # Engines are fixed after construction: merge the groups once
+        self._all_engines: Dict[str, BaseSearchEngine] = {
+            **self.clearnet_engines, **self.extended_engines,
+            **self.deep_engines, **self.darknet_engines,
+        }
+        # Engines queried by search_all, keyed by (include_deep, include_darknet)
+        self._engine_sets: Dict[Tuple[bool, bool], Dict[str, BaseSearchEngine]] = {}
+        for deep, darknet in itertools.product((False, True), repeat=2):
+            target = dict(self.clearnet_engines)
+            if deep:
+                target.update(self.extended_engines)
+                target.update(self.deep_engines)
+            if darknet:
+                target.update(self.darknet_engines)
+            self._engine_sets[deep, darknet] = target
+
+    def check_tor_connection(self, force: bool = False) -> bool:
+        """
+        Check if Tor is available and connected.
 
+        The answer is shared process-wide for TOR_CHECK_TTL seconds
+        (TOR_FAILURE_TTL when Tor was not reachable); concurrent callers
+        wait for one probe instead of each sending one. force probes again
+        regardless (or joins a probe already running).
+        """
+        global _tor_status, _tor_probe
+        with _tor_status_lock:
+            available, expires = _tor_status
+            if not force and time.monotonic() < expires:
+                return available
+            probe = _tor_probe
+            owner = probe is None
+            if owner:
+                probe = _tor_probe = threading.Event()
+
+        # The probe blocks for up to its timeout, so it runs outside the lock
+        if not owner:
+            probe.wait()
+            with _tor_status_lock:
+                return _tor_status[0]
+
+        available = False
         try:
-            proxies = {
-                "http": f"socks5h://{TOR_SOCKS_HOST}:{TOR_SOCKS_PORT}",
-                "https": f"socks5h://{TOR_SOCKS_HOST}:{TOR_SOCKS_PORT}"
-            }
-            response = requests.get(
-                "https://check.torproject.org/api/ip",
-                proxies=proxies,
-                timeout=10
-            )
-            data = response.json()
-            self._tor_available = data.get("IsTor", False)
-        except:
-            self._tor_available = False
-
-        return self._tor_available
+            available = _probe_tor()
+        finally:
+            ttl = TOR_CHECK_TTL if available else TOR_FAILURE_TTL
+            with _tor_status_lock:
+                _tor_status = (available, time.monotonic() + ttl)
+                _tor_probe = None
+            probe.set()
+        return available
 
     def get_available_engines(self, include_tor: bool = False, include_deep: bool = False) -> List[str]:
         """Get list of available engine names."""
-        engines = list(self.clearnet_engines.keys())
-        if include_deep:
-            engines.extend(self.extended_engines.keys())
-            engines.extend(self.deep_engines.keys())
-        if include_tor:
-            engines.extend(self.darknet_engines.keys())
-        return engines
+        return list(self._engine_sets[bool(include_deep), bool(include_tor)])
 
     def get_all_engines(self) -> Dict[str, BaseSearchEngine]:
-        """Get all engines as a single dictionary."""
-        all_engines = {}
-        all_engines.update(self.clearnet_engines)
-        all_engines.update(self.extended_engines)
-        all_engines.update(self.deep_engines)
-        all_engines.update(self.darknet_engines)
-        return all_engines
+        """Get all engines as a single dictionary (shared; do not modify)."""
+        return self._all_engines
+
+    def _select_engines(self, include_darknet: bool, include_deep: bool,
+                        engines: Optional[List[str]]) -> Dict[str, BaseSearchEngine]:
+        """Resolve the engines a search_all call should query."""
+        if engines:
+            wanted = set(engines)
+            return {
+                name: engine for name, engine in self._all_engines.items()
+                if name in wanted
+            }
+        return self._engine_sets[bool(include_deep), bool(include_darknet)]
+
+    def invalidate_cache(self):
+        """Forget cached engine results, so the next searches hit the network."""
+        BaseSearchEngine.cache.clear()
 
     def search_single(self, engine_name: str, query: str, max_results: int = 20,
                       progress_callback: Optional[Callable] = None) -> List[SearchResult]:
         """Search using a single engine."""
-        all_engines = self.get_all_engines()
-        engine = all_engines.get(engine_name)
+        engine = self._all_engines.get(engine_name)
         if not engine:
             raise ValueError(f"Unknown engine: {engine_name}")
 
@@ -1321,7 +1895,8 @@ class SearchEngineManager:
                    include_deep: bool = False,
                    max_results_per_engine: int = 20,
                    progress_callback: Optional[Callable] = None,
-                   engines: Optional[List[str]] = None) -> List[SearchResult]:
+                   engines: Optional[List[str]] = None,
+                   top_k: Optional[int] = None) -> List[SearchResult]:
         """
         Search across multiple engines.
 
@@ -1332,27 +1907,42 @@ class SearchEngineManager:
             max_results_per_engine: Max results per engine
             progress_callback: Callback for progress updates
             engines: Optional list of specific engines to use
+            top_k: Only return the top_k most relevant results
 
         Returns:
-            Combined list of search results
+            Combined list of search results, most relevant first
+
+        With aiohttp installed, engines are queried concurrently through
+        search_all_async(); inside a running event loop (use
+        search_all_async() there) or without aiohttp they are queried one by
+        one with REQUEST_DELAY between them.
+        """
+        if ASYNC_AVAILABLE and not _in_event_loop():
+            return asyncio.run(self.search_all_async(
+                query, include_darknet, include_deep, max_results_per_engine,
+                progress_callback, engines, top_k))
+
+        all_results = list(self.iter_search_all(
+            query, include_darknet, include_deep, max_results_per_engine,
+            progress_callback, engines))
+
+        return _by_relevance(all_results, top_k)
+
+    def iter_search_all(self, query: str, include_darknet: bool = False,
+                        include_deep: bool = False,
+                        max_results_per_engine: int = 20,
+                        progress_callback: Optional[Callable] = None,
+                        engines: Optional[List[str]] = None) -> Iterator[SearchResult]:
         """
-        all_results = []
+        Lazily search across multiple engines, one engine at a time.
 
+        Takes the same arguments as search_all() but yields each engine's
+        results (unsorted) as soon as that engine returns. An engine is only
+        queried when the consumer asks for more, so stopping early (e.g. with
+        itertools.islice) skips the remaining engines and their delays.
+        """
         # Determine which engines to use
-        if engines:
-            all_available = self.get_all_engines()
-            target_engines = {
-                name: engine for name, engine in all_available.items()
-                if name in engines
-            }
-        else:
-            target_engines = dict(self.clearnet_engines)
-            if include_deep:
-                target_engines.update(self.extended_engines)
-                target_engines.update(self.deep_engines)
-            if include_darknet:
-                target_engines.update(self.darknet_engines)
-
+        target_engines = self._select_engines(include_darknet, include_deep, engines)
         total_engines = len(target_engines)
 
         for i, (name, engine) in enumerate(target_engines.items()):
@@ -1369,22 +1959,87 @@ class SearchEngineManager:
                         continue
 
                 results = engine.search(query, max_results_per_engine, progress_callback)
-                all_results.extend(results)
 
                 if progress_callback:
                     progress_callback("manager", "engine_complete",
                                      f"{name}: {len(results)} results")
 
-                # Rate limiting between engines
-                if i < total_engines - 1:
-                    time.sleep(REQUEST_DELAY)
-
             except SearchError as e:
                 if progress_callback:
                     progress_callback(name, "error", str(e))
                 continue
 
-        # Sort by relevance
-        all_results.sort(key=lambda r: r.relevance, reverse=True)
+            yield from results
+
+            # Rate limiting between engines
+            if i < total_engines - 1:
+                time.sleep(REQUEST_DELAY)
+
+    async def search_all_async(self, query: str, include_darknet: bool = False,
+                               include_deep: bool = False,
+                               max_results_per_engine: int = 20,
+                               progress_callback: Optional[Callable] = None,
+                               engines: Optional[List[str]] = None,
+                               top_k: Optional[int] = None) -> List[SearchResult]:
+        """
+        Search across multiple engines concurrently.
+
+        Same arguments and result as search_all(), but every engine is
+        queried at once over one shared aiohttp session, so the total
+        latency is that of the slowest engine rather than the sum.
+        """
+        target_engines = self._select_engines(include_darknet, include_deep, engines)
+        total_engines = len(target_engines)
+
+        # The Tor probe is blocking; run it once, off the event loop
+        tor_ok = True
+        if any(engine.requires_tor for engine in target_engines.values()):
+            loop = asyncio.get_running_loop()
+            tor_ok = await loop.run_in_executor(None, self.check_tor_connection)
+
+        async def run_engine(i: int, name: str, engine: BaseSearchEngine,
+                             session) -> List[SearchResult]:
+            if progress_callback:
+                progress_callback("manager", "engine_start",
+                                 f"[{i+1}/{total_engines}] Starting {name}...")
+
+            if engine.requires_tor and not tor_ok:
+                if progress_callback:
+                    progress_callback(name, "skipped", "Tor not available")
+                return []
+
+            try:
+                results = await engine.search_async(
+                    query, max_results_per_engine, progress_callback, session)
+            except SearchError as e:
+                if progress_callback:
+                    progress_callback(name, "error", str(e))
+                return []
+
+            if progress_callback:
+                progress_callback("manager", "engine_complete",
+                                 f"{name}: {len(results)} results")
+            return results
+
+        async def gather_all(session, tor_session) -> List[List[SearchResult]]:
+            return await asyncio.gather(*[
+                run_engine(i, name, engine,
+                           tor_session if engine.requires_tor else session)
+                for i, (name, engine) in enumerate(target_engines.items())
+            ])
+
+        if ASYNC_AVAILABLE:
+            # Tor engines get their own SOCKS-backed session, opened only when needed
+            use_tor = tor_ok and any(e.requires_tor for e in target_engines.values())
+            async with _new_client_session() as session:
+                if use_tor:
+                    async with _new_client_session(use_tor=True) as tor_session:
+                        results_lists = await gather_all(session, tor_session)
+                else:
+                    results_lists = await gather_all(session, None)
+        else:
+            results_lists = await gather_all(None, None)
+
+        all_results = [r for results in results_lists for r in results]
 
-        return all_results
+        return _by_relevance(all_results, top_k)
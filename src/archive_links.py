@@ -3,12 +3,34 @@ Archive Links Module for WebSearchPro
 Generates archive.org and archive.is links for search results.
 """
 import hashlib
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 from urllib.parse import quote, urljoin
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class _RateLimiter:
+    """Thread-safe limiter spacing request starts at most rps per second."""
+    
+    def __init__(self, rps: float):
+        self.interval = 1.0 / rps
+        self._next = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        """Block until the caller may start its request."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
 
 
 class ArchiveLinkGenerator:
@@ -22,21 +44,35 @@ class ArchiveLinkGenerator:
     
     WAYBACK_API = "https://archive.org/wayback/available"
     WAYBACK_SAVE = "https://web.archive.org/save/"
+    WAYBACK_SEARCH = "https://web.archive.org/web/*/"
     ARCHIVE_IS = "https://archive.is/"
     ARCHIVE_TODAY = "https://archive.today/"
     
-    def __init__(self, timeout: int = 10):
+    HEADERS = {'User-Agent': 'WebSearchPro/2.0 Archive Checker'}
+    # Concurrent Wayback checks, and the rate they may start at
+    MAX_WORKERS = 16
+    REQUESTS_PER_SECOND = 10
+    
+    def __init__(self, timeout: int = 10, session: Optional[requests.Session] = None):
         """
         Initialize archive link generator.
         
         Args:
             timeout: Request timeout in seconds
+            session: Shared requests session to use (otherwise a pooled one
+                     is created and closed by close())
         """
         self.timeout = timeout
-        self._session = requests.Session()
-        self._session.headers.update({
-            'User-Agent': 'WebSearchPro/2.0 Archive Checker'
-        })
+        self._owns_session = session is None
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                  max_retries=Retry(total=2, connect=2, read=0, backoff_factor=0.3))
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        # Headers are passed per call so a shared session is never mutated
+        self._session = session
+        self._limiter = _RateLimiter(self.REQUESTS_PER_SECOND)
     
     def get_wayback_link(self, url: str, check_availability: bool = True) -> Optional[str]:
         """
@@ -51,9 +87,11 @@ class ArchiveLinkGenerator:
         """
         if check_availability:
             try:
+                self._limiter.wait()
                 response = self._session.get(
                     self.WAYBACK_API,
                     params={'url': url},
+                    headers=self.HEADERS,
                     timeout=self.timeout
                 )
                 
@@ -68,8 +106,7 @@ class ArchiveLinkGenerator:
             return None
         else:
             # Generate potential archive URL without checking
-            encoded = quote(url, safe='')
-            return f"https://web.archive.org/web/*/{encoded}"
+            return self.WAYBACK_SEARCH + quote(url, safe='')
     
     def get_archive_is_link(self, url: str) -> str:
         """
@@ -108,21 +145,33 @@ class ArchiveLinkGenerator:
         Returns:
             Dict with archive service names and URLs
         """
+        # Quote once; every service link embeds the same encoded URL
+        encoded = quote(url, safe='')
+        if check_wayback:
+            wayback = self.get_wayback_link(url, check_availability=True)
+        else:
+            wayback = self.WAYBACK_SEARCH + encoded
+        return self._archive_links(encoded, wayback)
+    
+    def _archive_links(self, encoded: str, wayback: Optional[str]) -> Dict[str, str]:
+        """
+        Archive links for a URL, given it quoted (safe='') and its Wayback
+        link (None if not archived).
+        """
         links = {}
         
         # Wayback Machine
-        wayback = self.get_wayback_link(url, check_availability=check_wayback)
         if wayback:
             links['wayback_machine'] = wayback
         else:
             # Provide search URL even if no archive found
-            links['wayback_search'] = f"https://web.archive.org/web/*/{quote(url, safe='')}"
+            links['wayback_search'] = self.WAYBACK_SEARCH + encoded
         
         # Archive.is
-        links['archive_is'] = self.get_archive_is_link(url)
+        links['archive_is'] = self.ARCHIVE_IS + encoded
         
         # Archive.today (same service, different domain)
-        links['archive_today'] = self.get_archive_today_link(url)
+        links['archive_today'] = self.ARCHIVE_TODAY + encoded
         
         return links
     
@@ -157,10 +206,20 @@ class ArchiveLinkGenerator:
         Returns:
             Results with added archive links
         """
-        for i, result in enumerate(results):
-            # Only check Wayback for first N results to avoid slowdown
-            check = check_wayback and i < limit
-            self.add_archive_links_to_result(result, check_wayback=check)
+        # Only check Wayback for first N results to avoid slowdown
+        checked = results[:limit] if check_wayback else []
+        if checked:
+            # One batch of concurrent lookups for all checked results
+            wayback = self.batch_check_wayback(
+                [result['url'] for result in checked if result.get('url')])
+            for result in checked:
+                url = result.get('url', '')
+                if url:
+                    result['archive_links'] = self._archive_links(
+                        quote(url, safe=''), wayback[url])
+        
+        for result in results[len(checked):]:
+            self.add_archive_links_to_result(result, check_wayback=False)
         
         return results
     
@@ -176,7 +235,8 @@ class ArchiveLinkGenerator:
         """
         try:
             save_url = f"{self.WAYBACK_SAVE}{url}"
-            response = self._session.get(save_url, timeout=30, allow_redirects=True)
+            response = self._session.get(save_url, headers=self.HEADERS,
+                                         timeout=30, allow_redirects=True)
             
             if response.status_code == 200:
                 # Return the final URL after redirects
@@ -196,15 +256,11 @@ class ArchiveLinkGenerator:
         Returns:
             Dict mapping URLs to their archive URLs (or None)
         """
-        results = {}
-        
-        for url in urls:
-            archive_url = self.get_wayback_link(url, check_availability=True)
-            results[url] = archive_url
-            # Rate limiting
-            time.sleep(0.5)
-        
-        return results
+        # Checks run concurrently; the rate limiter keeps them polite
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            archive_urls = executor.map(
+                lambda url: self.get_wayback_link(url, check_availability=True), urls)
+            return dict(zip(urls, archive_urls))
     
     def get_wayback_timestamps(self, url: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
@@ -227,6 +283,7 @@ class ArchiveLinkGenerator:
                     'limit': limit,
                     'fl': 'timestamp,statuscode,mimetype',
                 },
+                headers=self.HEADERS,
                 timeout=self.timeout
             )
             
@@ -238,21 +295,28 @@ class ArchiveLinkGenerator:
                 return []
             
             headers = data[0]
+            if 'timestamp' not in headers:
+                return []
+            ts_idx = headers.index('timestamp')
             snapshots = []
             
             for row in data[1:]:
-                snapshot = dict(zip(headers, row))
-                timestamp = snapshot.get('timestamp', '')
+                if len(row) <= ts_idx:
+                    continue
+                timestamp = row[ts_idx]
+                # Fixed-width YYYYMMDDHHmmss: slice it rather than strptime
+                if len(timestamp) != 14 or not timestamp.isdigit():
+                    continue
+                try:
+                    dt = datetime(int(timestamp[0:4]), int(timestamp[4:6]), int(timestamp[6:8]),
+                                  int(timestamp[8:10]), int(timestamp[10:12]), int(timestamp[12:14]))
+                except ValueError:
+                    continue
                 
-                if timestamp:
-                    # Parse timestamp (format: YYYYMMDDHHmmss)
-                    try:
-                        dt = datetime.strptime(timestamp, '%Y%m%d%H%M%S')
-                        snapshot['datetime'] = dt.isoformat()
-                        snapshot['archive_url'] = f"https://web.archive.org/web/{timestamp}/{url}"
-                        snapshots.append(snapshot)
-                    except ValueError:
-                        continue
+                snapshot = dict(zip(headers, row))
+                snapshot['datetime'] = dt.isoformat()
+                snapshot['archive_url'] = f"https://web.archive.org/web/{timestamp}/{url}"
+                snapshots.append(snapshot)
             
             return snapshots
             
@@ -260,8 +324,9 @@ class ArchiveLinkGenerator:
             return []
     
     def close(self):
-        """Close the session."""
-        self._session.close()
+        """Close the session (unless it was passed in)."""
+        if self._owns_session:
+            self._session.close()
 
 
 def add_archive_links(results: List[Dict[str, Any]], 
@@ -4,12 +4,51 @@ Removes duplicate and near-duplicate results using URL normalization and content
 """
 import hashlib
 import re
-from typing import Any, Dict, List, Optional, Set, Tuple
-from urllib.parse import urlparse, urlunparse, parse_qs, urlencode
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from operator import itemgetter
+from urllib.parse import urlparse, urlunparse, quote_plus, unquote_plus
 from difflib import SequenceMatcher
 
 from config import DEDUP_THRESHOLD, DEDUP_METHOD
 
+# Faster similarity scoring when rapidfuzz is installed
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# Faster content fingerprints when xxhash is installed
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# Content fingerprints are only compared for equality, so a fast
+# non-cryptographic 128-bit hash (or BLAKE2b in hashlib) replaces MD5
+if XXHASH_AVAILABLE:
+    _fingerprint = xxhash.xxh3_128_hexdigest
+else:
+    def _fingerprint(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _similarity(a: str, b: str, score_cutoff: float = 0.0) -> float:
+    """
+    Similarity ratio of two strings (0.0-1.0).
+    
+    With rapidfuzz, scores below score_cutoff come back as 0.0, which lets
+    it skip pairs that cannot reach the cutoff.
+    """
+    if RAPIDFUZZ_AVAILABLE:
+        return fuzz.ratio(a, b, score_cutoff=score_cutoff * 100) / 100
+    return SequenceMatcher(None, a, b).ratio()
+
+# Plain "name=value" query pairs, which decoding and re-encoding would
+# give back unchanged
+_PLAIN_PAIR_RE = re.compile(r'[\w.~-]+=[\w.~-]*', re.ASCII)
+
 
 class ResultDeduplicator:
     """
@@ -54,6 +93,12 @@ class ResultDeduplicator:
         'amp.reddit.com': 'reddit.com',
     }
     
+    # Directory index files dropped from URL paths
+    INDEX_FILES = ('/index.html', '/index.htm', '/index.php', '/default.html')
+    
+    # Most normalized URLs kept in the cache; the oldest go first
+    URL_CACHE_SIZE = 16384
+    
     def __init__(self, 
                  similarity_threshold: float = None,
                  method: str = None):
@@ -68,7 +113,7 @@ class ResultDeduplicator:
         self.method = method or DEDUP_METHOD
         
         # Caches
-        self._url_cache: Dict[str, str] = {}  # original -> normalized
+        self._url_cache: Dict[str, str] = {}  # original -> normalized (bounded, FIFO)
         self._content_hashes: Set[str] = set()
     
     def deduplicate(self, results: List[Dict[str, Any]]) -> Tuple[List[Dict], List[Dict]]:
@@ -113,9 +158,7 @@ class ResultDeduplicator:
         unique = []
         duplicates = []
         
-        for result in results:
-            content_hash = self.hash_content(result)
-            
+        for result, content_hash in zip(results, self.hash_contents_batch(results)):
             if content_hash in seen_hashes:
                 duplicates.append(result)
             else:
@@ -132,10 +175,26 @@ class ResultDeduplicator:
         unique = []
         duplicates = []
         
-        for result in results:
+        # Lowercased titles and snippets, extracted once and compared by index
+        titles = [result.get('title', '').lower() for result in results]
+        snippets = [result.get('snippet', '').lower() for result in results]
+        cutoff = self._title_cutoff()
+        if RAPIDFUZZ_AVAILABLE:
+            # Score every title pair in one C++ call (GIL released, all
+            # cores); only nonzero (>= cutoff) pairs can be near-duplicates
+            title_scores = process.cdist(titles, titles, scorer=fuzz.ratio,
+                                         score_cutoff=cutoff * 100, dtype='uint8',
+                                         workers=-1)
+        else:
+            matcher = SequenceMatcher(None)
+        content_hashes = self.hash_contents_batch(results)
+        # Indices of the unique results, in order
+        kept: Dict[int, None] = {}
+        
+        for i, result in enumerate(results):
             url = result.get('url', '')
             normalized_url = self.normalize_url(url)
-            content_hash = self.hash_content(result)
+            content_hash = content_hashes[i]
             
             # Check URL duplicate
             if normalized_url in seen_urls:
@@ -147,10 +206,18 @@ class ResultDeduplicator:
                 duplicates.append(result)
                 continue
             
-            # Check similarity with existing results
+            # Check similarity with the existing results whose titles are
+            # close enough; _similar_texts() verifies each candidate
+            if RAPIDFUZZ_AVAILABLE:
+                candidates = (j for j in title_scores[i, :i].nonzero()[0].tolist()
+                              if j in kept)
+            else:
+                matcher.set_seq2(titles[i])
+                candidates = self._quick_candidates(matcher, titles, kept, cutoff)
+            
             is_similar = False
-            for existing in unique:
-                if self._is_similar(result, existing):
+            for j in candidates:
+                if self._similar_texts(titles[i], snippets[i], titles[j], snippets[j]):
                     is_similar = True
                     duplicates.append(result)
                     break
@@ -161,6 +228,7 @@ class ResultDeduplicator:
                 result['normalized_url'] = normalized_url
                 result['content_hash'] = content_hash
                 unique.append(result)
+                kept[i] = None
         
         return unique, duplicates
     
@@ -210,22 +278,11 @@ class ResultDeduplicator:
             if path != '/' and path.endswith('/'):
                 path = path.rstrip('/')
             # Remove index files
-            for index in ['/index.html', '/index.htm', '/index.php', '/default.html']:
-                if path.endswith(index):
-                    path = path[:-len(index)] or '/'
+            if path.endswith(self.INDEX_FILES):
+                path = path[:path.rindex('/')] or '/'
             
             # Filter query parameters
-            if parsed.query:
-                params = parse_qs(parsed.query, keep_blank_values=True)
-                # Remove tracking parameters
-                filtered_params = {
-                    k: v for k, v in params.items() 
-                    if k.lower() not in self.STRIP_PARAMS
-                }
-                # Sort parameters for consistency
-                query = urlencode(sorted(filtered_params.items()), doseq=True)
-            else:
-                query = ''
+            query = self._filter_query(parsed.query) if parsed.query else ''
             
             # Reconstruct URL without fragment
             normalized = urlunparse((
@@ -238,52 +295,106 @@ class ResultDeduplicator:
             ))
             
             # Cache and return
+            if len(self._url_cache) >= self.URL_CACHE_SIZE:
+                del self._url_cache[next(iter(self._url_cache))]
             self._url_cache[url] = normalized
             return normalized
             
         except Exception:
             return url
     
+    @staticmethod
+    def _content_key(result: Dict[str, Any]) -> bytes:
+        """Lowercased, whitespace-normalized "title|snippet" to fingerprint."""
+        # split()/join() collapses and strips the same whitespace as \s+
+        title = ' '.join(result.get('title', '').lower().split())
+        snippet = ' '.join(result.get('snippet', '').lower().split())
+        return f"{title}|{snippet}".encode('utf-8')
+    
+    def _filter_query(self, query: str) -> str:
+        """
+        Drop STRIP_PARAMS from a query string and sort the rest by name.
+        
+        Gives the same result as parse_qs(keep_blank_values=True) followed
+        by urlencode(sorted(...), doseq=True), but plain pairs are kept as
+        they are and only the others are decoded and re-encoded.
+        """
+        pairs = []
+        for pair in query.split('&'):
+            if not pair:
+                continue
+            if _PLAIN_PAIR_RE.fullmatch(pair):
+                name = pair.partition('=')[0]
+            else:
+                raw_name, _, value = pair.partition('=')
+                name = unquote_plus(raw_name)
+                pair = f"{quote_plus(name)}={quote_plus(unquote_plus(value))}"
+            # Remove tracking parameters
+            if name.lower() not in self.STRIP_PARAMS:
+                pairs.append((name, pair))
+        # Sort parameters for consistency (stable, so repeated names keep their order)
+        pairs.sort(key=itemgetter(0))
+        return '&'.join(pair for _, pair in pairs)
+    
     def hash_content(self, result: Dict[str, Any]) -> str:
         """
         Create a hash of result content for duplicate detection.
         
         Uses title and snippet to create a fingerprint.
         """
-        title = result.get('title', '').lower().strip()
-        snippet = result.get('snippet', '').lower().strip()
-        
-        # Normalize whitespace
-        title = re.sub(r'\s+', ' ', title)
-        snippet = re.sub(r'\s+', ' ', snippet)
-        
-        # Create content string
-        content = f"{title}|{snippet}"
+        return _fingerprint(self._content_key(result))
+    
+    def hash_contents_batch(self, results: List[Dict[str, Any]]) -> List[str]:
+        """hash_content() for every result, in one pass."""
+        return [_fingerprint(key) for key in map(self._content_key, results)]
+    
+    @staticmethod
+    def _quick_candidates(matcher: SequenceMatcher, titles: List[str],
+                          kept: Dict[int, None], cutoff: float) -> Iterator[int]:
+        """
+        Yield the kept indices whose title may reach cutoff against
+        matcher's seq2, using difflib's cheap upper bounds on ratio().
+        """
+        for j in kept:
+            matcher.set_seq1(titles[j])
+            if (matcher.real_quick_ratio() >= cutoff and
+                    matcher.quick_ratio() >= cutoff):
+                yield j
+    
+    def _title_cutoff(self) -> float:
+        """
+        Lowest title similarity at which _is_similar() can still match.
         
-        # Hash it
-        return hashlib.md5(content.encode('utf-8')).hexdigest()
+        Below it neither the title check nor the 60/40 combined score
+        (snippet similarity is at most 1.0) can reach the threshold.
+        """
+        threshold = self.similarity_threshold
+        return min(threshold, max(0.5, (threshold - 0.4) / 0.6))
     
     def _is_similar(self, result1: Dict[str, Any], result2: Dict[str, Any]) -> bool:
         """
         Check if two results are similar (near-duplicates).
         
-        Uses SequenceMatcher for fuzzy matching.
+        Uses rapidfuzz (or SequenceMatcher) for fuzzy matching.
         """
+        return self._similar_texts(
+            result1.get('title', '').lower(), result1.get('snippet', '').lower(),
+            result2.get('title', '').lower(), result2.get('snippet', '').lower(),
+        )
+    
+    def _similar_texts(self, title1: str, snippet1: str, title2: str, snippet2: str) -> bool:
+        """_is_similar() on already-lowercased titles and snippets."""
         # Compare titles
-        title1 = result1.get('title', '').lower()
-        title2 = result2.get('title', '').lower()
-        
-        title_similarity = SequenceMatcher(None, title1, title2).ratio()
+        title_similarity = _similarity(title1, title2, self._title_cutoff())
         
         if title_similarity >= self.similarity_threshold:
             return True
         
         # Compare snippets if titles are somewhat similar
         if title_similarity >= 0.5:
-            snippet1 = result1.get('snippet', '').lower()
-            snippet2 = result2.get('snippet', '').lower()
-            
-            snippet_similarity = SequenceMatcher(None, snippet1, snippet2).ratio()
+            # Lowest snippet similarity that still reaches the threshold
+            snippet_cutoff = max(0.0, (self.similarity_threshold - title_similarity * 0.6) / 0.4)
+            snippet_similarity = _similarity(snippet1, snippet2, snippet_cutoff)
             
             # Combined similarity
             combined = (title_similarity * 0.6) + (snippet_similarity * 0.4)
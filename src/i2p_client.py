@@ -2,14 +2,26 @@
 I2P Client for WebSearchPro
 Provides I2P network integration for searching eepsites.
 """
+import asyncio
 import socket
+import threading
 import time
 from typing import Any, Callable, Dict, List, Optional
 from urllib.parse import urljoin
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from config import I2P_PROXY_HOST, I2P_PROXY_PORT, I2P_ENABLED
+from search_engines import _in_event_loop
+
+# Concurrent multi-engine search when aiohttp is installed
+try:
+    import aiohttp
+    ASYNC_AVAILABLE = True
+except ImportError:
+    ASYNC_AVAILABLE = False
 
 
 class I2PClient:
@@ -41,6 +53,14 @@ class I2PClient:
         },
     }
     
+    # Seconds a check_connection() result is reused before probing again
+    CONNECTION_CHECK_TTL = 30
+    
+    # Most simultaneous connections to the proxy in search_all()
+    MAX_CONNECTIONS = 10
+    
+    USER_AGENT = 'WebSearchPro/2.0 I2P Client'
+    
     def __init__(self, 
                  proxy_host: str = None,
                  proxy_port: int = None,
@@ -60,6 +80,11 @@ class I2PClient:
         
         self._session = None
         self._is_connected = False
+        # Monotonic time until which _is_connected is trusted
+        self._check_expires = 0.0
+        self._check_lock = threading.Lock()
+        # Set while a probe is running; later callers wait on it instead of probing
+        self._probe: Optional[threading.Event] = None
     
     @property
     def proxy_url(self) -> str:
@@ -71,12 +96,18 @@ class I2PClient:
         """Get or create requests session with I2P proxy."""
         if self._session is None:
             self._session = requests.Session()
+            # Reuse connections to the I2P proxy; retry failed connection
+            # setup briefly (read errors, e.g. timeouts, are not retried)
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50,
+                                  max_retries=Retry(total=2, connect=2, read=0, backoff_factor=0.3))
+            self._session.mount('http://', adapter)
+            self._session.mount('https://', adapter)
             self._session.proxies = {
                 'http': self.proxy_url,
                 'https': self.proxy_url,
             }
             self._session.headers.update({
-                'User-Agent': 'WebSearchPro/2.0 I2P Client',
+                'User-Agent': self.USER_AGENT,
             })
         return self._session
     
@@ -84,9 +115,39 @@ class I2PClient:
         """
         Check if I2P connection is available.
         
+        The result is reused for CONNECTION_CHECK_TTL seconds; concurrent
+        callers wait for one probe instead of each sending one.
+        
         Returns:
             True if connected, False otherwise
         """
+        with self._check_lock:
+            if time.monotonic() < self._check_expires:
+                return self._is_connected
+            probe = self._probe
+            owner = probe is None
+            if owner:
+                probe = self._probe = threading.Event()
+        
+        # The probe blocks for seconds, so it runs outside the lock
+        if not owner:
+            probe.wait()
+            with self._check_lock:
+                return self._is_connected
+        
+        connected = False
+        try:
+            connected = self._probe_connection()
+        finally:
+            with self._check_lock:
+                self._is_connected = connected
+                self._check_expires = time.monotonic() + self.CONNECTION_CHECK_TTL
+                self._probe = None
+            probe.set()
+        return connected
+    
+    def _probe_connection(self) -> bool:
+        """Probe the I2P proxy (and router console); True if it is up."""
         try:
             # Try to connect to proxy
             sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -95,7 +156,6 @@ class I2PClient:
             sock.close()
             
             if result != 0:
-                self._is_connected = False
                 return False
             
             # Try to access I2P router console (optional)
@@ -104,15 +164,12 @@ class I2PClient:
                     'http://127.0.0.1:7657/',
                     timeout=10
                 )
-                self._is_connected = response.status_code == 200
+                return response.status_code == 200
             except Exception:
                 # Proxy is up but console might not be accessible
-                self._is_connected = True
-            
-            return self._is_connected
+                return True
             
         except Exception:
-            self._is_connected = False
             return False
     
     @property
@@ -178,11 +235,7 @@ class I2PClient:
             return []
         
         try:
-            # Build search URL
-            search_url = urljoin(
-                engine_config['url'],
-                engine_config['search_path'].format(query=query)
-            )
+            search_url = self._search_url(engine, query)
             
             if progress_callback:
                 progress_callback("searching", f"Searching {engine_config['name']}...")
@@ -208,6 +261,107 @@ class I2PClient:
                 progress_callback("error", str(e))
             return []
     
+    def search_all(self,
+                   query: str,
+                   max_results: int = 20,
+                   engines: Optional[List[str]] = None,
+                   progress_callback: Callable = None) -> List[Dict[str, Any]]:
+        """
+        Search several I2P search engines and combine their results.
+        
+        Args:
+            query: Search query
+            max_results: Maximum results per engine
+            engines: Engines to query (default: all I2P_SEARCH_ENGINES)
+            progress_callback: Progress callback function
+            
+        Returns:
+            Combined list of search results, in engine order
+        
+        With aiohttp installed the engines are queried concurrently through
+        search_all_async(); inside a running event loop (use
+        search_all_async() there) or without aiohttp they are queried one
+        by one.
+        """
+        if ASYNC_AVAILABLE and not _in_event_loop():
+            return asyncio.run(self.search_all_async(
+                query, max_results, engines, progress_callback))
+        
+        results = []
+        for engine in self._engine_names(engines):
+            results.extend(self.search(query, engine, max_results, progress_callback))
+        return results
+    
+    async def search_all_async(self,
+                               query: str,
+                               max_results: int = 20,
+                               engines: Optional[List[str]] = None,
+                               progress_callback: Callable = None) -> List[Dict[str, Any]]:
+        """
+        Query several I2P search engines concurrently (see search_all).
+        
+        The pages are fetched through the proxy at the same time and parsed
+        in worker threads; an engine that fails contributes no results.
+        """
+        if not self.enabled:
+            return []
+        
+        engines = self._engine_names(engines)
+        
+        if progress_callback:
+            progress_callback("starting", f"Connecting to {len(engines)} I2P search engines...")
+        
+        # Usually answered from the cached check; a fresh probe blocks
+        if not await asyncio.to_thread(self.check_connection):
+            if progress_callback:
+                progress_callback("error", "I2P connection not available")
+            return []
+        
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        connector = aiohttp.TCPConnector(limit=self.MAX_CONNECTIONS)
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector,
+                                         headers={'User-Agent': self.USER_AGENT}) as session:
+            pages = await asyncio.gather(
+                *(self._fetch_search_page(session, engine, query) for engine in engines),
+                return_exceptions=True,
+            )
+        
+        results = []
+        for engine, html in zip(engines, pages):
+            name = self.I2P_SEARCH_ENGINES[engine]['name']
+            if isinstance(html, BaseException):
+                if progress_callback:
+                    progress_callback("error", f"{name}: {html}")
+                continue
+            found = await asyncio.to_thread(self._parse_search_results, html, engine, max_results)
+            results.extend(found)
+            if progress_callback:
+                progress_callback("complete", f"{name}: Found {len(found)} results")
+        
+        return results
+    
+    async def _fetch_search_page(self, session: 'aiohttp.ClientSession',
+                                 engine: str, query: str) -> str:
+        """Fetch one engine's result page through the I2P proxy."""
+        async with session.get(self._search_url(engine, query), proxy=self.proxy_url) as response:
+            if response.status != 200:
+                raise RuntimeError(f"HTTP {response.status}")
+            return await response.text()
+    
+    def _engine_names(self, engines: Optional[List[str]]) -> List[str]:
+        """Known engine names from engines (default: all of them)."""
+        if engines is None:
+            return list(self.I2P_SEARCH_ENGINES)
+        return [engine for engine in engines if engine in self.I2P_SEARCH_ENGINES]
+    
+    def _search_url(self, engine: str, query: str) -> str:
+        """Build an engine's search URL for query."""
+        engine_config = self.I2P_SEARCH_ENGINES[engine]
+        return urljoin(
+            engine_config['url'],
+            engine_config['search_path'].format(query=query)
+        )
+    
     def _parse_search_results(self, 
                               html: str, 
                               engine: str,
@@ -263,6 +417,7 @@ class I2PClient:
             self._session.close()
             self._session = None
         self._is_connected = False
+        self._check_expires = 0.0
 
 
 class I2PSearchEngine:
@@ -279,17 +434,18 @@ class I2PSearchEngine:
                max_results: int = 20,
                progress_callback: Callable = None) -> List[Dict[str, Any]]:
         """
-        Execute I2P search.
+        Execute I2P search across all I2P search engines (concurrently when
+        aiohttp is installed; see I2PClient.search_all).
         
         Args:
             query: Search query
-            max_results: Maximum results
+            max_results: Maximum results per engine
             progress_callback: Progress callback
             
         Returns:
             List of search results
         """
-        return self.client.search(
+        return self.client.search_all(
             query=query,
             max_results=max_results,
             progress_callback=progress_callback
@@ -79,6 +79,7 @@ class TerminalUI:
 | `/darknet` | Toggle darknet search |
 | `/i2p` | Toggle I2P network search |
 | `/tor` | Check Tor connection status |
+| `/refresh` | Clear cached results |
 | `/history` | Show search history |
 | `/export [format]` | Export last results (json/txt/md) |
 | `/report` | Generate HTML/Markdown reports |
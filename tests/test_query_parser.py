@@ -0,0 +1,24 @@
+"""Tests for search query parsing."""
+from query_parser import QueryParser
+
+
+def test_unbalanced_quote_before_proximity():
+    parsed = QueryParser().parse('"x "a b"~3')
+
+    assert parsed.proximity_searches == [('a b', 3)]
+    assert parsed.phrases == []
+
+
+def test_filters_after_unbalanced_quote_are_kept():
+    parsed = QueryParser().parse('"x site:example.com "a b"~3 filetype:pdf')
+
+    assert parsed.proximity_searches == [('a b', 3)]
+    assert parsed.site_filter == 'example.com'
+    assert parsed.filetype_filter == 'pdf'
+
+
+def test_phrase_before_proximity():
+    parsed = QueryParser().parse('"p" "a b"~3 c')
+
+    assert parsed.phrases == ['p']
+    assert parsed.proximity_searches == [('a b', 3)]
@@ -0,0 +1,33 @@
+"""Tests for search engine result parsing."""
+import search_engines as se
+
+FOOTER = '''<footer><p>Copyright Ahmia</p>
+<cite class="onion"><a href="http://footer.onion">footer</a></cite>
+<a href="http://footer.onion">About</a></footer>'''
+
+
+def test_ahmia_last_result_stops_at_its_container():
+    body = '''<ol class="searchResults"><li class="result">
+  <h4><a href="http://abc.onion/">Abc</a></h4>
+  <p>Desc of abc</p>
+  <p class="urlinfo"><cite class="onion"><a href="http://abc.onion/">abc.onion</a></cite></p>
+</li><li class="result"><h4><a href="http://def.onion/">Def</a></h4></li></ol>''' + FOOTER
+
+    rows = list(se.AhmiaSearch()._iter_regex_rows(body, 10))
+
+    assert rows == [
+        ("Abc", "http://abc.onion/", "Desc of abc"),
+        ("Def", "http://def.onion/", ""),
+    ]
+
+
+def test_nested_containers_keep_their_content():
+    body = ('<div class="result"><div><a href="http://t1.onion">T1</a></div><p>s1</p></div>'
+            '<div class="result"><div><a href="http://t2.onion">T2</a></div></div>' + FOOTER)
+
+    rows = list(se.TorchSearch()._iter_regex_rows(body, 10))
+
+    assert rows == [
+        ("T1", "http://t1.onion", "s1"),
+        ("T2", "http://t2.onion", ""),
+    ]
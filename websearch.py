@@ -508,9 +508,13 @@ class WebSearchPro:
                 for name in self.engine_manager.darknet_engines.keys():
                     self.enabled_engines[name] = False
 
+        elif cmd == "/refresh":
+            self.engine_manager.invalidate_cache()
+            self.ui.print_info("Cached results cleared; next searches query the engines again")
+
         elif cmd == "/tor":
             self.ui.print_info("Checking Tor connection...")
-            is_connected = self.engine_manager.check_tor_connection()
+            is_connected = self.engine_manager.check_tor_connection(force=True)
             self.ui.print_tor_status(is_connected)
 
         elif cmd == "/history":